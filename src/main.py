@@ -1,16 +1,29 @@
 from abc import ABC, abstractmethod
-import uuid
-from enum import Enum
+import atexit
+import os
+import sys
+from enum import Enum, IntEnum, StrEnum
 from typing import Protocol
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
+import logging.handlers
+import queue
+import time
 import heapq
-from typing import Optional, Callable
+import itertools
+import math
+import operator
+import threading
+from typing import Optional, Callable, Iterable, ClassVar
 from dataclasses import dataclass, field
+from fractions import Fraction
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 
 
 # ============ Enums ============
-class Currency(Enum):
+class Currency(StrEnum):
     RUB = "RUB"
     USD = "USD"
     EUR = "EUR"
@@ -18,40 +31,56 @@ class Currency(Enum):
     CNY = "CNY"
 
 
-class AccountType(Enum):
+class AccountType(StrEnum):
     LEGAL = "UL"  # Юридическое лицо
     INDIVIDUAL = "FL"  # Физическое лицо
 
 
-class AccountStatus(Enum):
+class AccountStatus(StrEnum):
     ACTIVE = "active"
     FROZEN = "frozen"
     CLOSED = "closed"
 
 
+# Члены статусов для горячих путей: одна загрузка глобального имени вместо
+# обращения к атрибуту класса Enum
+_AS_ACTIVE = AccountStatus.ACTIVE
+_AS_FROZEN = AccountStatus.FROZEN
+_AS_CLOSED = AccountStatus.CLOSED
+
+
 # ============ Exceptions ============
-class InvalidOperationError(Exception):
+class BankError(Exception):
+    """Базовое исключение банковской системы"""
+
+    default_message = "Bank error"
+
+    def __init__(self, message: str = None):
+        super().__init__(message or self.default_message)
+
+
+class InvalidOperationError(BankError):
     """Исключение для неверных операций"""
 
-    pass
+    default_message = "Invalid operation"
 
 
-class InsufficientFundsError(Exception):
+class InsufficientFundsError(BankError):
     """Исключение для недостаточных средств"""
 
-    pass
+    default_message = "Insufficient funds"
 
 
-class AccountClosedError(Exception):
+class AccountClosedError(BankError):
     """Исключение для закрытого счета"""
 
-    pass
+    default_message = "Account is closed"
 
 
-class AccountFrozenError(Exception):
+class AccountFrozenError(BankError):
     """Исключение для замороженного счета"""
 
-    pass
+    default_message = "Account is frozen"
 
 
 # ============ Protocols (Interface Segregation) ============
@@ -73,16 +102,76 @@ class AccountInfo(Protocol):
     def get_account_info(self) -> dict: ...
 
 
+class HourClock(Protocol):
+    """Интерфейс часов для ночного запрета операций"""
+
+    def hour(self) -> int: ...
+
+
+# ============ Money ============
+class Money:
+    """Перевод сумм между рублями (float) и целыми копейками"""
+
+    MINOR_UNITS = 100
+
+    @staticmethod
+    def to_minor(amount: float) -> int:
+        return round(amount * Money.MINOR_UNITS)
+
+    @staticmethod
+    def to_major(minor: int) -> float:
+        return minor / Money.MINOR_UNITS
+
+    @staticmethod
+    def is_positive_minor(amount: float) -> bool:
+        """Сумма конечна и to_minor даёт хотя бы одну копейку (round: 0.5 -> 0)"""
+        return 0.5 < amount * Money.MINOR_UNITS < math.inf
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def rate_ratio(rate: float) -> tuple[int, int]:
+        """Ставка как несократимая дробь по её десятичной записи: 0.0125 -> (1, 80)"""
+        ratio = Fraction(str(rate))
+        return ratio.numerator, ratio.denominator
+
+    @staticmethod
+    def apply_rate(minor: int, rate: float) -> int:
+        """minor * rate в целых копейках, округление банковское, как у round()"""
+        numerator, denominator = Money.rate_ratio(rate)
+        quotient, remainder = divmod(minor * numerator, denominator)
+        twice = 2 * remainder
+        if twice > denominator or (twice == denominator and quotient & 1):
+            quotient += 1
+        return quotient
+
+
 # ============ Validators (Single Responsibility) ============
 class AmountValidator:
     """Валидация сумм операций"""
 
     @staticmethod
     def validate(amount: float) -> None:
-        if not isinstance(amount, (int, float)):
-            raise InvalidOperationError("Amount must be a number")
-        if amount <= 0:
+        # Быстрый путь для int/float: сравнение типа без обхода MRO
+        amount_type = type(amount)
+        if amount_type is float or amount_type is int:
+            value = amount
+        else:
+            # bool — подкласс int, но суммой не является
+            if amount_type is bool:
+                raise InvalidOperationError("Amount must be a number")
+            # EAFP: сумма должна складываться с float-балансом
+            try:
+                value = 0.0 + amount
+            except TypeError:
+                raise InvalidOperationError("Amount must be a number") from None
+
+        if Money.is_positive_minor(value):
+            return
+        if not value > 0:  # в том числе NaN
             raise InvalidOperationError("Amount must be positive")
+        if value < 1:
+            raise InvalidOperationError("Amount must be at least one kopeck")
+        raise InvalidOperationError("Amount must be finite")
 
 
 class BalanceValidator:
@@ -92,18 +181,81 @@ class BalanceValidator:
     def validate(balance: float) -> None:
         if balance < 0:
             raise InsufficientFundsError("Balance cannot be negative")
+        if not balance < math.inf:  # inf и NaN
+            raise InvalidOperationError("Balance must be finite")
+
+
+class CurrencyValidator:
+    """Валидация валюты счета"""
+
+    # Члены StrEnum равны своим строкам: один словарь принимает и "RUB", и Currency.RUB
+    ALLOWED_VALUES = {currency.value: currency for currency in Currency}
+
+    @classmethod
+    def validate(cls, currency: Currency) -> Currency:
+        member = cls.ALLOWED_VALUES.get(currency)
+        if member is None:
+            raise InvalidOperationError(f"Unsupported currency: {currency!r}")
+        return member
+
+
+class AccountTypeValidator:
+    """Валидация типа счета"""
+
+    ALLOWED_TYPES = {account_type.value: account_type for account_type in AccountType}
+
+    @classmethod
+    def validate(cls, account_type: AccountType) -> AccountType:
+        member = cls.ALLOWED_TYPES.get(account_type)
+        if member is None:
+            raise InvalidOperationError(f"Unsupported account type: {account_type!r}")
+        return member
+
+
+# Номера изменений активов; next() на count атомарен под GIL
+_ASSET_VERSIONS = itertools.count(1)
 
 
 class Asset:
     """Базовый класс для активов"""
 
+    __slots__ = ("symbol", "_quantity", "_price", "_value")
+
+    # Номер последнего изменения цены или количества любого актива:
+    # кэши стоимости портфелей сверяются с ним, не храня ссылок на счета
+    _version: ClassVar[int] = 0
+
     def __init__(self, symbol: str, quantity: float, price: float):
         self.symbol = symbol
-        self.quantity = quantity
-        self.price = price
+        self._quantity = quantity
+        self._price = price
+        self._value = quantity * price  # пересчитывается только в сеттерах
+
+    def _changed(self) -> None:
+        """Пересчитать стоимость и сбросить кэши портфелей"""
+        self._value = self._quantity * self._price
+        Asset._version = next(_ASSET_VERSIONS)
+
+    @property
+    def quantity(self) -> float:
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, quantity: float) -> None:
+        self._quantity = quantity
+        self._changed()
+
+    @property
+    def price(self) -> float:
+        return self._price
+
+    @price.setter
+    def price(self, price: float) -> None:
+        self._price = price
+        self._changed()
 
     def get_value(self) -> float:
-        return self.quantity * self.price
+        return self._value
 
     def __str__(self) -> str:
         return f"{self.symbol}: {self.quantity} шт. @ {self.price}"
@@ -112,6 +264,8 @@ class Asset:
 class Stock(Asset):
     """Акции"""
 
+    __slots__ = ("dividend_yield",)
+
     def __init__(
         self, symbol: str, quantity: float, price: float, dividend_yield: float = 0.0
     ):
@@ -122,6 +276,8 @@ class Stock(Asset):
 class Bond(Asset):
     """Облигации"""
 
+    __slots__ = ("coupon_rate",)
+
     def __init__(
         self, symbol: str, quantity: float, price: float, coupon_rate: float = 0.0
     ):
@@ -132,6 +288,8 @@ class Bond(Asset):
 class ETF(Asset):
     """ETF-фонды"""
 
+    __slots__ = ("expense_ratio",)
+
     def __init__(
         self, symbol: str, quantity: float, price: float, expense_ratio: float = 0.0
     ):
@@ -139,15 +297,21 @@ class ETF(Asset):
         self.expense_ratio = expense_ratio
 
 
+# Статусы, запрещающие операции, и соответствующие им исключения
+_STATUS_ERRORS: dict[AccountStatus, type[BankError]] = {
+    _AS_FROZEN: AccountFrozenError,
+    _AS_CLOSED: AccountClosedError,
+}
+
+
 class AccountStatusValidator:
     """Валидация статуса счета"""
 
     @staticmethod
     def validate_for_operation(status: AccountStatus) -> None:
-        if status == AccountStatus.FROZEN:
-            raise AccountFrozenError("Account is frozen")
-        if status == AccountStatus.CLOSED:
-            raise AccountClosedError("Account is closed")
+        error = _STATUS_ERRORS.get(status)
+        if error is not None:
+            raise error()  # сообщение по умолчанию из default_message
 
 
 # ============ Logger Interface (Dependency Inversion) ============
@@ -162,35 +326,171 @@ class TransactionLogger(ABC):
     def log_withdrawal(self, amount: float, balance: float) -> None:
         pass
 
+    def log_event(self, message: str) -> None:
+        """Прочие события счёта и очереди; по умолчанию игнорируются"""
+        pass
+
 
 class ConsoleLogger(TransactionLogger):
     """Логирование в консоль"""
 
     def log_deposit(self, amount: float, balance: float) -> None:
-        print(f"Внесено: {amount}")
-        print(f"На счету: {balance}")
+        sys.stdout.write(f"Внесено: {amount}\nНа счету: {balance}\n")
+
+    def log_withdrawal(self, amount: float, balance: float) -> None:
+        sys.stdout.write(f"Снято: {amount}\nНа счету: {balance}\n")
+
+    def log_event(self, message: str) -> None:
+        sys.stdout.write(message + "\n")
+
+
+# ConsoleLogger не хранит состояния — один экземпляр на все счета по умолчанию
+_DEFAULT_CONSOLE_LOGGER = ConsoleLogger()
+
+
+class NullLogger(TransactionLogger):
+    """Логирование отключено: пакетные операции не вызывают логгер вовсе"""
+
+    def log_deposit(self, amount: float, balance: float) -> None:
+        pass
+
+    def log_withdrawal(self, amount: float, balance: float) -> None:
+        pass
+
+
+class DebugLogger(TransactionLogger):
+    """Ленивое логирование через logging: строка форматируется только на DEBUG"""
+
+    def __init__(self, name: str = __name__):
+        self.logger = logging.getLogger(name)
+
+    def log_deposit(self, amount: float, balance: float) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Deposit: %s, New balance: %s", amount, balance)
 
     def log_withdrawal(self, amount: float, balance: float) -> None:
-        print(f"Снято: {amount}")
-        print(f"На счету: {balance}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Withdrawal: %s, New balance: %s", amount, balance)
+
+    def log_event(self, message: str) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s", message)
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Форматтер записей транзакций: метка времени пересчитывается раз в секунду"""
+
+    def __init__(self):
+        super().__init__()
+        self._cached_second = None
+        self._cached_stamp = ""
+
+    def format(self, record: logging.LogRecord) -> str:
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_stamp = time.strftime(
+                "%Y-%m-%d %H:%M:%S", self.converter(record.created)
+            )
+        return (
+            f"{self._cached_stamp},{int(record.msecs):03d} - "
+            f"{record.levelname} - {record.getMessage()}"
+        )
+
+
+class _SharedFileSink:
+    """Общий для всех FileLogger одного файла: логгер, очередь и фоновый писатель"""
+
+    MAX_BYTES = 10_000_000
+    BACKUP_COUNT = 5
+
+    _sinks: dict = {}
+    _lock = threading.Lock()
+    _counter = itertools.count()
+
+    def __init__(self, filename: str, index: int):
+        self.filename = filename
+        self.users = 0
+        self.logger = logging.getLogger(f"{__name__}.file{index}")
+        self.logger.setLevel(logging.INFO)
+        # Записи уходят только в файл, не дублируясь в обработчиках предков
+        self.logger.propagate = False
+        self._file_handler = logging.handlers.RotatingFileHandler(
+            filename, maxBytes=self.MAX_BYTES, backupCount=self.BACKUP_COUNT
+        )
+        self._file_handler.setFormatter(_CachedTimeFormatter())
+
+        # Запись на диск идёт в фоновом потоке: операции только кладут запись в очередь
+        log_queue = queue.SimpleQueue()
+        self._queue_handler = logging.handlers.QueueHandler(log_queue)
+        self._listener = logging.handlers.QueueListener(log_queue, self._file_handler)
+        self._listener.start()
+        self.logger.addHandler(self._queue_handler)
+
+    @classmethod
+    def acquire(cls, filename: str) -> "_SharedFileSink":
+        """Получить приёмник для файла, создав его при первом обращении"""
+        key = os.path.abspath(filename)
+        with cls._lock:
+            sink = cls._sinks.get(key)
+            if sink is None:
+                sink = cls(filename, next(cls._counter))
+                cls._sinks[key] = sink
+            sink.users += 1
+            return sink
+
+    def release(self) -> None:
+        """Отпустить приёмник; последний пользователь дописывает очередь и закрывает файл"""
+        key = os.path.abspath(self.filename)
+        with self._lock:
+            self.users -= 1
+            # После close_all приёмник уже остановлен и убран из реестра
+            if self.users or self._sinks.get(key) is not self:
+                return
+            del self._sinks[key]
+        self._stop()
+
+    def _stop(self) -> None:
+        """Дописать очередь в файл и закрыть его"""
+        self.logger.removeHandler(self._queue_handler)
+        self._listener.stop()  # дожидается записи всех событий из очереди
+        self._file_handler.close()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Остановить все приёмники при выходе: иначе поток-демон теряет хвост очереди"""
+        with cls._lock:
+            sinks = list(cls._sinks.values())
+            cls._sinks.clear()
+        for sink in sinks:
+            sink._stop()
+
+
+atexit.register(_SharedFileSink.close_all)
 
 
 class FileLogger(TransactionLogger):
     """Логирование в файл"""
 
     def __init__(self, filename: str = "transactions.log"):
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
-        handler = logging.FileHandler(filename)
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        # Логгеры одного файла делят обработчик: без дублей строк и лишних дескрипторов
+        self._sink = _SharedFileSink.acquire(filename)
+        self.logger = self._sink.logger
+
+    def close(self) -> None:
+        """Дописать накопленные записи и закрыть файл"""
+        if self._sink is not None:
+            self._sink.release()
+            self._sink = None
 
     def log_deposit(self, amount: float, balance: float) -> None:
-        self.logger.info(f"Deposit: {amount}, New balance: {balance}")
+        self.logger.info("Deposit: %s, New balance: %s", amount, balance)
 
     def log_withdrawal(self, amount: float, balance: float) -> None:
-        self.logger.info(f"Withdrawal: {amount}, New balance: {balance}")
+        self.logger.info("Withdrawal: %s, New balance: %s", amount, balance)
+
+    def log_event(self, message: str) -> None:
+        self.logger.info("%s", message)
 
 
 # ============ UUID Generator (Single Responsibility) ============
@@ -199,13 +499,57 @@ class UUIDGenerator:
 
     @staticmethod
     def generate() -> str:
-        return str(uuid.uuid4())
+        return os.urandom(16).hex()
+
+    @staticmethod
+    def generate_short(length: int = 8) -> str:
+        """Короткий идентификатор: читается только нужное число случайных байт"""
+        return os.urandom((length + 1) // 2).hex()[:length]
+
+    @staticmethod
+    def generate_many(count: int) -> list[str]:
+        """Пакетная генерация: один вызов os.urandom на все идентификаторы"""
+        raw = os.urandom(16 * count).hex()
+        return [raw[i : i + 32] for i in range(0, 32 * count, 32)]
+
+
+class CoarseClock:
+    """Текущий час с кэшированием до границы часа (не дольше refresh_seconds)"""
+
+    def __init__(self, refresh_seconds: float = 30.0):
+        self.refresh_seconds = refresh_seconds
+        self._hour = 0
+        self._expires_at = float("-inf")
+
+    def hour(self) -> int:
+        mono = time.monotonic()
+        if mono >= self._expires_at:
+            now = datetime.now()
+            until_next_hour = 3600 - (
+                now.minute * 60 + now.second + now.microsecond / 1_000_000
+            )
+            self._hour = now.hour
+            self._expires_at = mono + min(until_next_hour, self.refresh_seconds)
+        return self._hour
 
 
 # ============ Abstract Account ============
 class AbstractAccount(ABC):
     """Базовый абстрактный класс счета"""
 
+    __slots__ = (
+        "account_uuid",
+        "first_last_name",
+        "_balance_minor",
+        "status",
+        "account_type",
+        "currency",
+        "_lock",
+    )
+
+    # Разрешен ли уход в минус (проверка атрибута вместо isinstance)
+    has_overdraft: ClassVar[bool] = False
+
     def __init__(
         self,
         account_uuid: str,
@@ -217,10 +561,27 @@ class AbstractAccount(ABC):
     ):
         self.account_uuid = account_uuid
         self.first_last_name = first_last_name
-        self._balance = balance
+        # Баланс хранится в копейках: сложение целых без ошибок округления float
+        self._balance_minor = Money.to_minor(balance)
         self.status = status
         self.account_type = account_type
         self.currency = currency
+        # Изменение баланса (проверка остатка + запись) выполняется под блокировкой
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """Состояние для pickle/copy: все слоты, кроме блокировки"""
+        state = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if name != "_lock" and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._lock = threading.Lock()
 
     @abstractmethod
     def deposit(self, amount: float) -> None:
@@ -240,13 +601,27 @@ class AbstractAccount(ABC):
     @property
     def balance(self) -> float:
         """Получение баланса"""
-        return self._balance
+        return self._balance_minor / 100
 
 
 # ============ Bank Account Implementation ============
 class BankAccount(AbstractAccount):
     """Банковский счет с dependency injection"""
 
+    __slots__ = ("_logger", "_str_cache", "_info_template")
+
+    _SEP = "=" * 20
+    _TEMPLATE = (
+        "{sep}\n"
+        "Счет {uuid}\n"
+        "Владелец: {owner}\n"
+        "Тип: {type}\n"
+        "Валюта: {currency}\n"
+        "Баланс: {balance}\n"
+        "Статус: {status}\n"
+        "{sep}"
+    )
+
     def __init__(
         self,
         first_last_name: str,
@@ -259,6 +634,10 @@ class BankAccount(AbstractAccount):
     ):
         # Валидация при создании
         BalanceValidator.validate(balance)
+        # Строки приводятся к членам Enum: горячие пути сравнивают статусы через is
+        account_type = AccountTypeValidator.validate(account_type)
+        currency = CurrencyValidator.validate(currency)
+        status = AccountStatus(status)
 
         # Генерация UUID если не предоставлен
         if account_uuid is None:
@@ -266,9 +645,11 @@ class BankAccount(AbstractAccount):
 
         # Dependency Injection для логгера
         if logger is None:
-            logger = ConsoleLogger()
+            logger = _DEFAULT_CONSOLE_LOGGER
 
         self._logger = logger
+        self._str_cache = None  # (снимок полей, строка)
+        self._info_template = None  # неизменяемая часть get_account_info
 
         super().__init__(
             account_uuid=account_uuid,
@@ -281,51 +662,163 @@ class BankAccount(AbstractAccount):
 
     def deposit(self, amount: float) -> None:
         """Пополнение счета"""
-        AmountValidator.validate(amount)
+        # Встроенная проверка для int/float; остальное и ошибки — через валидатор
+        amount_type = type(amount)
+        if (amount_type is not float and amount_type is not int) or not Money.is_positive_minor(amount):
+            AmountValidator.validate(amount)
+        AccountStatusValidator.validate_for_operation(self.status)
+        with self._lock:
+            self._deposit_unchecked(amount)
+
+    def _deposit_unchecked(self, amount: float) -> None:
+        """Зачисление без проверок суммы и статуса — их выполнил вызывающий"""
+        self._balance_minor += Money.to_minor(amount)
+        self._logger.log_deposit(amount, self.balance)
+
+    def deposit_many(self, amounts: Iterable[float]) -> None:
+        """Пакетное пополнение: проверки выполняются один раз до зачисления"""
+        amounts = list(amounts)
+        for amount in amounts:
+            AmountValidator.validate(amount)
         AccountStatusValidator.validate_for_operation(self.status)
 
-        self._balance += amount
-        self._logger.log_deposit(amount, self._balance)
+        to_minor = Money.to_minor
+        if isinstance(self._logger, NullLogger):
+            with self._lock:
+                self._balance_minor += sum(map(to_minor, amounts))
+            return
+
+        log_deposit = self._logger.log_deposit
+        with self._lock:
+            balance_minor = self._balance_minor
+            for amount in amounts:
+                balance_minor += to_minor(amount)
+                log_deposit(amount, balance_minor / 100)
+            self._balance_minor = balance_minor
+
+    def make_fast_deposit(self) -> tuple[Callable[[float], None], Callable[[], None]]:
+        """Быстрые зачисления для счетов-сборщиков: суммы копятся в замыкании до flush"""
+        AccountStatusValidator.validate_for_operation(self.status)
+        units = Money.MINOR_UNITS
+        pending_minor = 0
+
+        def fast_deposit(amount: float) -> None:
+            nonlocal pending_minor
+            # Та же проверка, что и в deposit
+            amount_type = type(amount)
+            if (amount_type is not float and amount_type is not int) or not Money.is_positive_minor(amount):
+                AmountValidator.validate(amount)
+            pending_minor += round(amount * units)
+
+        def flush() -> None:
+            nonlocal pending_minor
+            if not pending_minor:
+                return
+            # Статус проверяется на момент зачисления; при отказе суммы не теряются
+            AccountStatusValidator.validate_for_operation(self.status)
+            amount_minor, pending_minor = pending_minor, 0
+            with self._lock:
+                self._deposit_unchecked(amount_minor / units)
+
+        return fast_deposit, flush
 
     def withdraw(self, amount: float) -> None:
         """Снятие со счета"""
-        AmountValidator.validate(amount)
+        amount_type = type(amount)
+        if (amount_type is not float and amount_type is not int) or not Money.is_positive_minor(amount):
+            AmountValidator.validate(amount)
         AccountStatusValidator.validate_for_operation(self.status)
+        with self._lock:
+            self._withdraw_unchecked(amount)
 
-        if self._balance < amount:
+    def _withdraw_unchecked(self, amount: float) -> None:
+        """Снятие без проверок суммы и статуса; правила остатка проверяются"""
+        amount_minor = Money.to_minor(amount)
+        if self._balance_minor < amount_minor:
             raise InsufficientFundsError("Insufficient funds for withdrawal")
 
-        self._balance -= amount
-        self._logger.log_withdrawal(amount, self._balance)
+        self._balance_minor -= amount_minor
+        self._logger.log_withdrawal(amount, self.balance)
 
     def get_account_info(self) -> dict:
         """Получение информации о счете"""
-        return {
-            "uuid": self.account_uuid,
-            "owner": self.first_last_name,
-            "type": self.account_type.value,
-            "currency": self.currency.value,
-            "balance": self._balance,
-            "status": self.status.value,
-        }
+        template = self._info_template
+        # Шаблон пересобирается, только если переназначили UUID, владельца, тип или валюту
+        if (
+            template is None
+            or template["uuid"] is not self.account_uuid
+            or template["owner"] is not self.first_last_name
+            or template["type"] != self.account_type
+            or template["currency"] != self.currency
+        ):
+            template = self._info_template = {
+                "uuid": self.account_uuid,
+                "owner": self.first_last_name,
+                "type": self.account_type.value,
+                "currency": self.currency.value,
+            }
+        info = template.copy()
+        info["balance"] = self.balance
+        info["status"] = self.status.value
+        return info
 
     def __str__(self) -> str:
-        return (
-            f"{'=' * 20}\n"
-            f"Счет {self.account_uuid}\n"
-            f"Владелец: {self.first_last_name}\n"
-            f"Тип: {self.account_type.value}\n"
-            f"Валюта: {self.currency.value}\n"
-            f"Баланс: {self._balance}\n"
-            f"Статус: {self.status.value}\n"
-            f"{'=' * 20}"
+        # Строка пересобирается только если изменилось одно из полей
+        key = (
+            self.account_uuid,
+            self.first_last_name,
+            self.account_type,
+            self.currency,
+            self._balance_minor,
+            self.status,
         )
+        cached = self._str_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        text = self._TEMPLATE.format(
+            sep=self._SEP,
+            uuid=self.account_uuid,
+            owner=self.first_last_name,
+            type=self.account_type,
+            currency=self.currency,
+            balance=self.balance,
+            status=self.status.value,
+        )
+        self._str_cache = (key, text)
+        return text
 
 
 # ============ SavingsAccount  ============
 class SavingsAccount(BankAccount):
     """Сберегательный счет с процентами"""
 
+    __slots__ = (
+        "_min_balance",
+        "_min_balance_minor",
+        "_min_balance_message",
+        "monthly_interest_rate",
+        "_rate_text",
+    )
+
+    _SUBTYPE = "Savings"
+
+    _SEP = "=" * 30
+    _TEMPLATE = (
+        "{sep}\n"
+        "💰 СБЕРЕГАТЕЛЬНЫЙ СЧЕТ\n"
+        "{sep}\n"
+        "UUID: {uuid}\n"
+        "Владелец: {owner}\n"
+        "Тип: {type}\n"
+        "Валюта: {currency}\n"
+        "Баланс: {balance:.2f}\n"
+        "Мин. остаток: {min_balance:.2f}\n"
+        "Ставка: {rate:.2f}%/мес\n"
+        "Статус: {status}\n"
+        "{sep}"
+    )
+
     def __init__(
         self,
         first_last_name: str,
@@ -352,55 +845,78 @@ class SavingsAccount(BankAccount):
         )
         self.min_balance = min_balance
         self.monthly_interest_rate = monthly_interest_rate
+        self._rate_text = (None, "")  # (ставка, строка "N%") для get_account_info
 
-    def withdraw(self, amount: float) -> None:
-        """Снятие со счета с учетом минимального остатка"""
-        AmountValidator.validate(amount)
-        AccountStatusValidator.validate_for_operation(self.status)
+    @property
+    def min_balance(self) -> float:
+        """Минимальный остаток"""
+        return self._min_balance
+
+    @min_balance.setter
+    def min_balance(self, min_balance: float) -> None:
+        self._min_balance = min_balance
+        # Граница в копейках и текст отказа готовятся один раз, а не при каждом снятии
+        self._min_balance_minor = Money.to_minor(min_balance)
+        self._min_balance_message = (
+            f"Withdrawal would violate minimum balance requirement of {min_balance}"
+        )
 
-        if self._balance - amount < self.min_balance:
-            raise InsufficientFundsError(
-                f"Withdrawal would violate minimum balance requirement of {self.min_balance}"
-            )
+    def _withdraw_unchecked(self, amount: float) -> None:
+        """Снятие со счета с учетом минимального остатка"""
+        amount_minor = Money.to_minor(amount)
+        if self._balance_minor - amount_minor < self._min_balance_minor:
+            raise InsufficientFundsError(self._min_balance_message)
 
-        self._balance -= amount
-        self._logger.log_withdrawal(amount, self._balance)
+        self._balance_minor -= amount_minor
+        self._logger.log_withdrawal(amount, self.balance)
 
     def apply_monthly_interest(self) -> None:
         """Начисление месячных процентов"""
         AccountStatusValidator.validate_for_operation(self.status)
 
-        interest = self._balance * self.monthly_interest_rate
-        self._balance += interest
-        print(f"💰 Начислены проценты: {interest:.2f} {self.currency.value}")
-        print(f"📈 Новый баланс: {self._balance:.2f} {self.currency.value}")
+        with self._lock:
+            interest = self._accrue_interest()
+        self._logger.log_event(
+            f"💰 Начислены проценты: {interest:.2f} {self.currency}\n"
+            f"📈 Новый баланс: {self.balance:.2f} {self.currency}"
+        )
+
+    def _accrue_interest(self) -> float:
+        """Начисление процентов без проверок и вывода; возвращает сумму"""
+        # Проценты считаются в целых копейках и округляются до копейки
+        interest_minor = Money.apply_rate(self._balance_minor, self.monthly_interest_rate)
+        self._balance_minor += interest_minor
+        return interest_minor / 100
 
     def get_account_info(self) -> dict:
         """Получение информации о счете"""
+        rate = self.monthly_interest_rate
+        rate_text = self._rate_text
+        # Строка ставки форматируется заново только после смены ставки
+        if rate_text[0] != rate:
+            rate_text = self._rate_text = (rate, f"{rate * 100}%")
+
         info = super().get_account_info()
         info.update(
             {
-                "account_subtype": "Savings",
+                "account_subtype": self._SUBTYPE,
                 "min_balance": self.min_balance,
-                "monthly_interest_rate": f"{self.monthly_interest_rate * 100}%",
+                "monthly_interest_rate": rate_text[1],
             }
         )
         return info
 
     def __str__(self) -> str:
-        return (
-            f"{'=' * 30}\n"
-            f"💰 СБЕРЕГАТЕЛЬНЫЙ СЧЕТ\n"
-            f"{'=' * 30}\n"
-            f"UUID: {self.account_uuid}\n"
-            f"Владелец: {self.first_last_name}\n"
-            f"Тип: {self.account_type.value}\n"
-            f"Валюта: {self.currency.value}\n"
-            f"Баланс: {self._balance:.2f}\n"
-            f"Мин. остаток: {self.min_balance:.2f}\n"
-            f"Ставка: {self.monthly_interest_rate * 100:.2f}%/мес\n"
-            f"Статус: {self.status.value}\n"
-            f"{'=' * 30}"
+        return self._TEMPLATE.format(
+            sep=self._SEP,
+            uuid=self.account_uuid,
+            owner=self.first_last_name,
+            type=self.account_type,
+            currency=self.currency,
+            balance=self.balance,
+            min_balance=self.min_balance,
+            rate=self.monthly_interest_rate * 100,
+            status=self.status,
         )
 
 
@@ -408,6 +924,29 @@ class SavingsAccount(BankAccount):
 class PremiumAccount(BankAccount):
     """Премиум счет с овердрафтом"""
 
+    __slots__ = ("_overdraft_limit", "_min_balance_minor", "fixed_fee", "_fee_charged")
+
+    has_overdraft: ClassVar[bool] = True
+
+    _SUBTYPE = "Premium"
+
+    _SEP = "=" * 30
+    _TEMPLATE = (
+        "{sep}\n"
+        "⭐ ПРЕМИУМ СЧЕТ\n"
+        "{sep}\n"
+        "UUID: {uuid}\n"
+        "Владелец: {owner}\n"
+        "Тип: {type}\n"
+        "Валюта: {currency}\n"
+        "Баланс: {balance:.2f}\n"
+        "Лимит овердрафта: {overdraft_limit:.2f}\n"
+        "Доступно: {available:.2f}\n"
+        "Комиссия: {fee:.2f}\n"
+        "Статус: {status}\n"
+        "{sep}"
+    )
+
     def __init__(
         self,
         first_last_name: str,
@@ -438,36 +977,51 @@ class PremiumAccount(BankAccount):
         """Получение статуса комиссии"""
         return self._fee_charged
 
-    def withdraw(self, amount: float) -> None:
-        """Снятие со счета с учетом овердрафта"""
-        AmountValidator.validate(amount)
-        AccountStatusValidator.validate_for_operation(self.status)
+    @property
+    def overdraft_limit(self) -> float:
+        """Лимит овердрафта"""
+        return self._overdraft_limit
 
-        if self._balance - amount < -self.overdraft_limit:
+    @overdraft_limit.setter
+    def overdraft_limit(self, overdraft_limit: float) -> None:
+        self._overdraft_limit = overdraft_limit
+        # Нижняя граница баланса в копейках хранится готовой для проверки при снятии
+        self._min_balance_minor = -Money.to_minor(overdraft_limit)
+
+    def _withdraw_unchecked(self, amount: float) -> None:
+        """Снятие со счета с учетом овердрафта"""
+        amount_minor = Money.to_minor(amount)
+        if self._balance_minor - amount_minor < self._min_balance_minor:
             raise InsufficientFundsError(
                 f"Withdrawal exceeds overdraft limit of {self.overdraft_limit}"
             )
 
-        was_positive = self._balance >= 0
-        self._balance -= amount
-        is_negative = self._balance < 0
+        self._balance_minor -= amount_minor
 
-        # Начисляем комиссию при ПЕРВОМ уходе в овердрафт
-        if was_positive and is_negative and not self._fee_charged:
-            self._balance -= self.fixed_fee
+        # Начисляем комиссию при ПЕРВОМ уходе в овердрафт: флаг сбрасывается
+        # только при возврате баланса в неотрицательную зону
+        if self._balance_minor < 0 and not self._fee_charged:
+            self._balance_minor -= Money.to_minor(self.fixed_fee)
             self._fee_charged = True
-            print(
-                f"💳 Начислена комиссия за овердрафт: {self.fixed_fee} {self.currency.value}"
+            self._logger.log_event(
+                f"💳 Начислена комиссия за овердрафт: {self.fixed_fee} {self.currency}"
             )
 
-        self._logger.log_withdrawal(amount, self._balance)
+        self._logger.log_withdrawal(amount, self.balance)
 
-    def deposit(self, amount: float) -> None:
+    def _deposit_unchecked(self, amount: float) -> None:
         """Пополнение с возвратом статуса комиссии"""
-        super().deposit(amount)
+        super()._deposit_unchecked(amount)
 
         # Сбрасываем флаг комиссии, если вышли из овердрафта
-        if self._balance >= 0:
+        if self._balance_minor >= 0:
+            self._fee_charged = False
+
+    def deposit_many(self, amounts: Iterable[float]) -> None:
+        """Пакетное пополнение с возвратом статуса комиссии"""
+        super().deposit_many(amounts)
+
+        if self._balance_minor >= 0:
             self._fee_charged = False
 
     def get_account_info(self) -> dict:
@@ -475,30 +1029,30 @@ class PremiumAccount(BankAccount):
         info = super().get_account_info()
         info.update(
             {
-                "account_subtype": "Premium",
+                "account_subtype": self._SUBTYPE,
                 "overdraft_limit": self.overdraft_limit,
                 "fixed_fee": self.fixed_fee,
-                "available_balance": self._balance + self.overdraft_limit,
+                "available_balance": self._available_balance(),
             }
         )
         return info
 
+    def _available_balance(self) -> float:
+        """Баланс с учётом лимита овердрафта"""
+        return (self._balance_minor - self._min_balance_minor) / 100
+
     def __str__(self) -> str:
-        available = self._balance + self.overdraft_limit
-        return (
-            f"{'=' * 30}\n"
-            f"⭐ ПРЕМИУМ СЧЕТ\n"
-            f"{'=' * 30}\n"
-            f"UUID: {self.account_uuid}\n"
-            f"Владелец: {self.first_last_name}\n"
-            f"Тип: {self.account_type.value}\n"
-            f"Валюта: {self.currency.value}\n"
-            f"Баланс: {self._balance:.2f}\n"
-            f"Лимит овердрафта: {self.overdraft_limit:.2f}\n"
-            f"Доступно: {available:.2f}\n"
-            f"Комиссия: {self.fixed_fee:.2f}\n"
-            f"Статус: {self.status.value}\n"
-            f"{'=' * 30}"
+        return self._TEMPLATE.format(
+            sep=self._SEP,
+            uuid=self.account_uuid,
+            owner=self.first_last_name,
+            type=self.account_type,
+            currency=self.currency,
+            balance=self.balance,
+            overdraft_limit=self.overdraft_limit,
+            available=self._available_balance(),
+            fee=self.fixed_fee,
+            status=self.status,
         )
 
 
@@ -506,6 +1060,32 @@ class PremiumAccount(BankAccount):
 class InvestmentAccount(BankAccount):
     """Инвестиционный счет с портфелем активов"""
 
+    __slots__ = (
+        "_portfolio",
+        "_portfolio_value",
+        "_portfolio_version",
+        "expected_annual_return",
+    )
+
+    _SUBTYPE = "Investment"
+    _SEP = "=" * 30
+    _TEMPLATE = (
+        "{sep}\n"
+        "📈 ИНВЕСТИЦИОННЫЙ СЧЕТ\n"
+        "{sep}\n"
+        "UUID: {uuid}\n"
+        "Владелец: {owner}\n"
+        "Тип: {type}\n"
+        "Валюта: {currency}\n"
+        "Свободные средства: {balance:.2f}\n"
+        "Стоимость портфеля: {portfolio_value:.2f}\n"
+        "Общая стоимость: {total_value:.2f}\n"
+        "Ожидаемая доходность: {expected_return:.1f}%/год\n"
+        "Портфель ({assets_count} активов):\n{portfolio}\n"
+        "Статус: {status}\n"
+        "{sep}"
+    )
+
     def __init__(
         self,
         first_last_name: str,
@@ -526,7 +1106,9 @@ class InvestmentAccount(BankAccount):
             account_uuid=account_uuid,
             logger=logger,
         )
-        self.portfolio: list[Asset] = []
+        self._portfolio: list[Asset] = []  # меняется только через add_asset/add_assets
+        self._portfolio_value = 0.0
+        self._portfolio_version = -1  # Asset._version на момент подсчёта; -1 — кэш пуст
         self.expected_annual_return = expected_annual_return
 
     def add_asset(self, asset: Asset) -> None:
@@ -534,34 +1116,78 @@ class InvestmentAccount(BankAccount):
         AccountStatusValidator.validate_for_operation(self.status)
 
         cost = asset.get_value()
-        if self._balance < cost:
-            raise InsufficientFundsError(
-                f"Insufficient funds to buy asset. Need: {cost}"
-            )
+        cost_minor = Money.to_minor(cost)
+        with self._lock:
+            if self._balance_minor < cost_minor:
+                raise InsufficientFundsError(
+                    f"Insufficient funds to buy asset. Need: {cost}"
+                )
+            self._balance_minor -= cost_minor
+        self._portfolio.append(asset)
+        self._portfolio_version = -1
+        self._logger.log_event(
+            f"📊 Куплен актив: {asset}\n💰 Потрачено: {cost:.2f} {self.currency}"
+        )
 
-        self._balance -= cost
-        self.portfolio.append(asset)
-        print(f"📊 Куплен актив: {asset}")
-        print(f"💰 Потрачено: {cost:.2f} {self.currency.value}")
+    def add_assets(self, assets: Iterable[Asset]) -> None:
+        """Пакетная покупка активов: одна проверка средств и одна запись в лог"""
+        AccountStatusValidator.validate_for_operation(self.status)
+
+        assets = list(assets)
+        if not assets:
+            return
+        costs = [asset.get_value() for asset in assets]
+        to_minor = Money.to_minor
+        total_minor = sum(to_minor(cost) for cost in costs)
+        with self._lock:
+            if self._balance_minor < total_minor:
+                raise InsufficientFundsError(
+                    f"Insufficient funds to buy assets. Need: {total_minor / 100}"
+                )
+            self._balance_minor -= total_minor
+        self._portfolio.extend(assets)
+        self._portfolio_version = -1
+        self._logger.log_event(
+            f"📊 Куплено активов: {len(assets)}\n"
+            f"💰 Потрачено: {total_minor / 100:.2f} {self.currency}"
+        )
+
+    @property
+    def portfolio(self) -> tuple[Asset, ...]:
+        """Активы портфеля только для чтения: состав меняется через add_asset/add_assets"""
+        return tuple(self._portfolio)
 
     def get_portfolio_value(self) -> float:
         """Общая стоимость портфеля"""
-        return sum(asset.get_value() for asset in self.portfolio)
+        # add_asset/add_assets сбрасывают версию, сеттеры активов меняют Asset._version
+        version = Asset._version
+        if self._portfolio_version != version:
+            self._portfolio_value = sum(asset.get_value() for asset in self._portfolio)
+            self._portfolio_version = version
+        return self._portfolio_value
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        # Номера версий активов в другом процессе не совпадают — кэш пересчитается
+        self._portfolio_version = -1
 
     def get_total_value(self) -> float:
         """Общая стоимость счета (баланс + портфель)"""
-        return self._balance + self.get_portfolio_value()
+        return self.balance + self.get_portfolio_value()
 
     def project_yearly_growth(self, years: int = 1) -> dict:
         """Прогноз роста на N лет"""
         current_value = self.get_total_value()
-        projected_values = {}
+        growth = 1 + self.expected_annual_return
 
-        for year in range(1, years + 1):
-            projected_value = current_value * (
-                (1 + self.expected_annual_return) ** year
-            )
-            projected_values[f"year_{year}"] = round(projected_value, 2)
+        # Накопительное умножение в C-цикле accumulate вместо степени на каждый год
+        values = itertools.accumulate(
+            itertools.repeat(growth, years), operator.mul, initial=current_value
+        )
+        next(values)  # начальное значение — текущая стоимость
+        projected_values = {
+            f"year_{year}": round(value, 2) for year, value in enumerate(values, 1)
+        }
 
         return {
             "current_value": round(current_value, 2),
@@ -569,29 +1195,27 @@ class InvestmentAccount(BankAccount):
             "projections": projected_values,
         }
 
-    def withdraw(self, amount: float) -> None:
+    def _withdraw_unchecked(self, amount: float) -> None:
         """Снятие только из свободных средств (не из портфеля)"""
-        AmountValidator.validate(amount)
-        AccountStatusValidator.validate_for_operation(self.status)
-
-        if self._balance < amount:
+        amount_minor = Money.to_minor(amount)
+        if self._balance_minor < amount_minor:
             raise InsufficientFundsError(
-                f"Insufficient free cash. Available: {self._balance}, "
+                f"Insufficient free cash. Available: {self.balance}, "
                 f"Portfolio value: {self.get_portfolio_value()}"
             )
 
-        self._balance -= amount
-        self._logger.log_withdrawal(amount, self._balance)
+        self._balance_minor -= amount_minor
+        self._logger.log_withdrawal(amount, self.balance)
 
     def get_account_info(self) -> dict:
         """Получение информации о счете"""
         info = super().get_account_info()
         info.update(
             {
-                "account_subtype": "Investment",
+                "account_subtype": self._SUBTYPE,
                 "portfolio_value": self.get_portfolio_value(),
                 "total_value": self.get_total_value(),
-                "assets_count": len(self.portfolio),
+                "assets_count": len(self._portfolio),
                 "expected_annual_return": f"{self.expected_annual_return * 100}%",
             }
         )
@@ -602,28 +1226,36 @@ class InvestmentAccount(BankAccount):
         total_value = self.get_total_value()
 
         portfolio_str = (
-            "\n".join([f"  • {asset}" for asset in self.portfolio]) or "  (пусто)"
+            "\n".join([f"  • {asset}" for asset in self._portfolio]) or "  (пусто)"
         )
 
-        return (
-            f"{'=' * 30}\n"
-            f"📈 ИНВЕСТИЦИОННЫЙ СЧЕТ\n"
-            f"{'=' * 30}\n"
-            f"UUID: {self.account_uuid}\n"
-            f"Владелец: {self.first_last_name}\n"
-            f"Тип: {self.account_type.value}\n"
-            f"Валюта: {self.currency.value}\n"
-            f"Свободные средства: {self._balance:.2f}\n"
-            f"Стоимость портфеля: {portfolio_value:.2f}\n"
-            f"Общая стоимость: {total_value:.2f}\n"
-            f"Ожидаемая доходность: {self.expected_annual_return * 100:.1f}%/год\n"
-            f"Портфель ({len(self.portfolio)} активов):\n{portfolio_str}\n"
-            f"Статус: {self.status.value}\n"
-            f"{'=' * 30}"
+        return self._TEMPLATE.format(
+            sep=self._SEP,
+            uuid=self.account_uuid,
+            owner=self.first_last_name,
+            type=self.account_type,
+            currency=self.currency,
+            balance=self.balance,
+            portfolio_value=portfolio_value,
+            total_value=total_value,
+            expected_return=self.expected_annual_return * 100,
+            assets_count=len(self._portfolio),
+            portfolio=portfolio_str,
+            status=self.status,
         )
 
 
 class Client(BankAccount):
+    __slots__ = (
+        "client_id",
+        "full_name",
+        "birth_date",
+        "phone",
+        "email",
+        "accounts",
+        "_account_refs",
+    )
+
     def __init__(
         self,
         client_id: str,
@@ -633,36 +1265,52 @@ class Client(BankAccount):
         email: str = "",
         status: AccountStatus = AccountStatus.ACTIVE,
     ):
-        self.client_id = client_id or UUIDGenerator.generate()
+        self.client_id = sys.intern(client_id or UUIDGenerator.generate())
         self.full_name = full_name
         self.birth_date = birth_date
         self.phone = phone
         self.email = email
         self.status = status
         self.accounts: list[str] = []  # UUID счетов
+        self._account_refs: list[AbstractAccount] = []  # сами счета, если известны
 
         self._validate_age()
 
-    def add_account(self, account_uuid: str) -> None:  # ← ДОБАВЬ ЭТОТ МЕТОД
-        """Добавить UUID счёта к списку счетов клиента"""
-        if self.status != AccountStatus.ACTIVE:
+    def add_account(
+        self, account_uuid: str, account: AbstractAccount = None
+    ) -> None:  # ← ДОБАВЬ ЭТОТ МЕТОД
+        """Добавить UUID счёта (и сам счёт, если передан) к счетам клиента"""
+        if self.status is not _AS_ACTIVE:
             raise AccountFrozenError("Cannot add accounts to inactive client")
         self.accounts.append(account_uuid)
+        if account is not None:
+            self._account_refs.append(account)
 
     def _validate_age(self) -> None:
-        birth = datetime.strptime(self.birth_date, "%Y-%m-%d")
-        age = datetime.now().year - birth.year
+        # Полная запись YYYY-MM-DD разбирается вручную: strptime заметно дороже;
+        # остальные варианты (например, 1990-1-5) — через strptime
+        raw = self.birth_date
+        if len(raw) == 10 and raw[4] == "-" and raw[7] == "-":
+            birth = date(int(raw[0:4]), int(raw[5:7]), int(raw[8:10]))
+        else:
+            birth = datetime.strptime(raw, "%Y-%m-%d").date()
+
+        today = date.today()
+        age = today.year - birth.year - (
+            (today.month, today.day) < (birth.month, birth.day)
+        )
         if age < 18:
             raise InvalidOperationError("Client must be at least 18 years old")
 
 
 class Bank:
-    def __init__(self, logger: TransactionLogger = None):
+    def __init__(self, logger: TransactionLogger = None, clock: HourClock = None):
         self.clients: dict[str, Client] = {}  # client_id -> Client
         self.accounts: dict[str, AbstractAccount] = {}  # account_uuid -> Account
         self.failed_attempts: dict[str, int] = {}  # client_id -> count
         self.suspicious_actions: set[str] = set()  # client_ids
-        self._logger = logger or ConsoleLogger()
+        self._logger = logger or _DEFAULT_CONSOLE_LOGGER
+        self._clock = clock or CoarseClock()
 
     def add_client(self, client: Client) -> None:
         if client.client_id in self.clients:
@@ -670,7 +1318,7 @@ class Bank:
         self.clients[client.client_id] = client
 
     def authenticate_client(self, client_id: str, pin: str) -> bool:
-        now_hour = datetime.now().hour
+        now_hour = self._clock.hour()
         if 0 <= now_hour < 5:
             raise InvalidOperationError("Operations forbidden from 00:00 to 05:00")
 
@@ -694,18 +1342,24 @@ class Bank:
             raise AccountClosedError("Authentication failed")
 
         client = self.clients[client_id]
-        if client.status != AccountStatus.ACTIVE:
+        if client.status is not _AS_ACTIVE:
             raise AccountFrozenError("Client inactive")
 
+        try:
+            client_account_type = AccountType(client_id[:2].upper())  # UL/FL из ID
+        except ValueError:
+            raise InvalidOperationError("Unknown client type") from None
+
         account = account_type(
             first_last_name=client.full_name,
-            account_type=client_id[:2].upper(),  # UL/FL из ID
+            account_type=client_account_type,
             currency=currency,
             **kwargs,
         )
-        account_uuid = account.account_uuid
+        # UUID интернируется один раз — при попадании в банк; клиент получает ту же строку
+        account_uuid = sys.intern(account.account_uuid)
         self.accounts[account_uuid] = account
-        client.add_account(account_uuid)
+        client.add_account(account_uuid, account)
         return account_uuid
 
     def close_account(self, account_uuid: str, client_id: str) -> None:
@@ -725,6 +1379,34 @@ class Bank:
         if account_uuid in self.accounts:
             self.accounts[account_uuid].status = AccountStatus.ACTIVE
 
+    def bulk_deposit(self, deposits: Iterable[tuple[str, float]]) -> None:
+        """Пакетное пополнение счетов: пакет проверяется целиком до зачисления"""
+        grouped: dict[str, list[float]] = {}
+        for account_uuid, amount in deposits:
+            if account_uuid not in self.accounts:
+                raise InvalidOperationError("Account not found")
+            AmountValidator.validate(amount)
+            grouped.setdefault(account_uuid, []).append(amount)
+
+        for account_uuid in grouped:
+            AccountStatusValidator.validate_for_operation(
+                self.accounts[account_uuid].status
+            )
+
+        for account_uuid, amounts in grouped.items():
+            self.accounts[account_uuid].deposit_many(amounts)
+
+    def apply_monthly_interest_batch(self) -> int:
+        """Начисление процентов по всем активным сберегательным счетам"""
+        active = _AS_ACTIVE
+        credited = 0
+        for account in self.accounts.values():
+            if isinstance(account, SavingsAccount) and account.status is active:
+                with account._lock:
+                    account._accrue_interest()
+                credited += 1
+        return credited
+
     def search_accounts(self, client_id: str) -> list[dict]:
         if client_id not in self.clients:
             return []
@@ -734,32 +1416,44 @@ class Bank:
         ]
 
     def get_total_balance(self) -> float:
-        return sum(
-            acc.balance
-            for acc in self.accounts.values()
-            if acc.status == AccountStatus.ACTIVE
+        # Счета меняют баланс сами, без ссылки на банк, поэтому сумма
+        # считается по месту одним проходом без вызова свойства balance
+        active = _AS_ACTIVE
+        total_minor = sum(
+            [
+                acc._balance_minor
+                for acc in self.accounts.values()
+                if acc.status is active
+            ]
         )
+        return total_minor / 100
 
     def get_clients_ranking(self, top_n: int = 10) -> list[dict]:
         ranking = []
         for client in self.clients.values():
-            total = sum(
-                self.accounts[uuid].balance
-                for uuid in client.accounts
-                if uuid in self.accounts
-            )
+            refs = client._account_refs
+            if len(refs) == len(client.accounts):
+                # Все счета открыты через банк — суммируем без поиска по словарю
+                total = sum([account.balance for account in refs])
+            else:
+                total = sum(
+                    self.accounts[uuid].balance
+                    for uuid in client.accounts
+                    if uuid in self.accounts
+                )
             ranking.append({"client": client.full_name, "total": total})
-        return sorted(ranking, key=lambda x: x["total"], reverse=True)[:top_n]
+        # Частичная выборка top_n: O(C log top_n) вместо полной сортировки
+        return heapq.nlargest(top_n, ranking, key=lambda x: x["total"])
 
 
-class TransactionType(Enum):
+class TransactionType(StrEnum):
     DEPOSIT = "deposit"
     WITHDRAWAL = "withdrawal"
     TRANSFER = "transfer"
     EXTERNAL_TRANSFER = "external_transfer"
 
 
-class TransactionStatus(Enum):
+class TransactionStatus(StrEnum):
     PENDING = "pending"
     PROCESSING = "processing"
     COMPLETED = "completed"
@@ -767,14 +1461,32 @@ class TransactionStatus(Enum):
     CANCELLED = "cancelled"
 
 
-class TransactionPriority(Enum):
+class TransactionPriority(IntEnum):
     LOW = 3
     NORMAL = 2
     HIGH = 1
     URGENT = 0
 
 
-@dataclass
+class FailureReason(IntEnum):
+    """Машиночитаемая причина отказа; текст остаётся в failure_reason"""
+
+    INSUFFICIENT_FUNDS = 1
+    ACCOUNT_FROZEN = 2
+    ACCOUNT_CLOSED = 3
+    ACCOUNT_NOT_FOUND = 4
+    RETRIES_EXCEEDED = 5
+    UNSUPPORTED_TYPE = 6
+
+
+_TT_DEPOSIT = TransactionType.DEPOSIT
+_TT_WITHDRAWAL = TransactionType.WITHDRAWAL
+_TT_TRANSFER = TransactionType.TRANSFER
+_TT_EXTERNAL_TRANSFER = TransactionType.EXTERNAL_TRANSFER
+_TS_CANCELLED = TransactionStatus.CANCELLED
+
+
+@dataclass(slots=True)
 class Transaction:
     """Модель транзакции с полной историей"""
 
@@ -790,16 +1502,23 @@ class Transaction:
     created_at: datetime = field(default_factory=datetime.now)
     processed_at: Optional[datetime] = None
     priority: TransactionPriority = TransactionPriority.NORMAL
+    failure_code: Optional[FailureReason] = None
+
+    def __post_init__(self) -> None:
+        # ID — ключ словаря очереди: интернированная строка сравнивается по ссылке
+        if type(self.transaction_id) is str:
+            self.transaction_id = sys.intern(self.transaction_id)
 
     def mark_completed(self) -> None:
         """Отметить транзакцию как успешную"""
         self.status = TransactionStatus.COMPLETED
         self.processed_at = datetime.now()
 
-    def mark_failed(self, reason: str) -> None:
+    def mark_failed(self, reason: str, code: Optional[FailureReason] = None) -> None:
         """Отметить транзакцию как неудачную"""
         self.status = TransactionStatus.FAILED
         self.failure_reason = reason
+        self.failure_code = code
         self.processed_at = datetime.now()
 
     def mark_cancelled(self) -> None:
@@ -814,37 +1533,51 @@ class Transaction:
         """Сумма с комиссией"""
         return self.amount + self.fee
 
+    def queue_key(self) -> tuple:
+        """Ключ сортировки для очереди: (приоритет, время создания) на текущий момент"""
+        return (int(self.priority), self.created_at)
+
     def __lt__(self, other):
         """Сравнение для приоритетной очереди"""
-        if self.priority.value != other.priority.value:
-            return self.priority.value < other.priority.value
-        return self.created_at < other.created_at
+        return self.queue_key() < other.queue_key()
 
 
 class TransactionQueue:
     """Очередь транзакций с приоритетами и отложенным выполнением"""
 
-    def __init__(self):
-        self._queue: list[tuple] = []  # heap: (priority, timestamp, transaction)
-        self._scheduled: list[tuple] = []  # (execute_at, transaction)
+    def __init__(self, logger: TransactionLogger = None):
+        self._logger = logger or _DEFAULT_CONSOLE_LOGGER
+        self._queue: list[tuple] = []  # heap: ((priority, timestamp), seq, transaction)
+        self._scheduled: list[tuple] = []  # heap: (execute_at_ns, seq, transaction)
+        self._seq = itertools.count()  # FIFO среди равных ключей
         self._transactions: dict[str, Transaction] = {}
+        self._pending = 0  # без отменённых, которые ещё лежат в кучах
 
     def add_transaction(self, transaction: Transaction, delay_seconds: int = 0) -> None:
         """Добавить транзакцию в очередь"""
+        # Счётчик _pending учитывает только ожидающие транзакции
+        if transaction.status is not TransactionStatus.PENDING:
+            raise InvalidOperationError("Only pending transactions can be queued")
         self._transactions[transaction.transaction_id] = transaction
+        self._pending += 1
 
         if delay_seconds > 0:
+            # Срок по монотонным часам в нс: перевод системных часов не влияет
+            execute_at_ns = time.monotonic_ns() + int(delay_seconds * 1_000_000_000)
+            heapq.heappush(
+                self._scheduled,
+                (execute_at_ns, next(self._seq), transaction),
+            )
             execute_at = datetime.now() + timedelta(seconds=delay_seconds)
-            self._scheduled.append((execute_at, transaction))
-            print(
+            self._logger.log_event(
                 f"⏳ Транзакция {transaction.transaction_id} отложена до {execute_at.strftime('%H:%M:%S')}"
             )
         else:
             heapq.heappush(
                 self._queue,
-                (transaction.priority.value, transaction.created_at, transaction),
+                (transaction.queue_key(), next(self._seq), transaction),
             )
-            print(
+            self._logger.log_event(
                 f"➕ Транзакция {transaction.transaction_id} добавлена с приоритетом {transaction.priority.name}"
             )
 
@@ -853,33 +1586,32 @@ class TransactionQueue:
         # Проверяем отложенные транзакции
         self._process_scheduled()
 
-        if not self._queue:
-            return None
+        queue = self._queue
+        while queue:
+            _, _, transaction = heapq.heappop(queue)
+            # Отменённые удаляются лениво — при извлечении, без перестройки кучи
+            if transaction.status is _TS_CANCELLED:
+                continue
+            self._pending -= 1
+            transaction.status = TransactionStatus.PROCESSING
+            return transaction
 
-        _, _, transaction = heapq.heappop(self._queue)
-        transaction.status = TransactionStatus.PROCESSING
-        return transaction
+        return None
 
     def _process_scheduled(self) -> None:
         """Переместить готовые отложенные транзакции в основную очередь"""
-        now = datetime.now()
-        ready = []
-        still_scheduled = []
-
-        for execute_at, transaction in self._scheduled:
-            if execute_at <= now:
-                ready.append(transaction)
-            else:
-                still_scheduled.append((execute_at, transaction))
-
-        self._scheduled = still_scheduled
+        now = time.monotonic_ns()
+        scheduled = self._scheduled
 
-        for transaction in ready:
+        while scheduled and scheduled[0][0] <= now:
+            _, seq, transaction = heapq.heappop(scheduled)
+            if transaction.status is _TS_CANCELLED:
+                continue
             heapq.heappush(
                 self._queue,
-                (transaction.priority.value, transaction.created_at, transaction),
+                (transaction.queue_key(), seq, transaction),
             )
-            print(
+            self._logger.log_event(
                 f"⏰ Отложенная транзакция {transaction.transaction_id} готова к выполнению"
             )
 
@@ -892,14 +1624,16 @@ class TransactionQueue:
 
         try:
             transaction.mark_cancelled()
-            # Удаляем из очереди (помечаем как отменённую)
-            return True
         except InvalidOperationError:
             return False
 
+        # Запись остаётся в куче и пропускается при извлечении
+        self._pending -= 1
+        return True
+
     def get_pending_count(self) -> int:
         """Количество ожидающих транзакций"""
-        return len(self._queue) + len(self._scheduled)
+        return self._pending
 
     def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
         """Получить транзакцию по ID"""
@@ -919,6 +1653,14 @@ class CurrencyConverter:
         Currency.CNY: 13.5,
     }
 
+    # Кросс-курсы (from, to) -> коэффициент, считаются один раз при загрузке
+    _CROSS_RATES = {
+        (from_currency, to_currency): from_rate / to_rate
+        for (from_currency, from_rate), (to_currency, to_rate) in itertools.product(
+            RATES.items(), repeat=2
+        )
+    }
+
     @classmethod
     def convert(
         cls, amount: float, from_currency: Currency, to_currency: Currency
@@ -927,15 +1669,23 @@ class CurrencyConverter:
         if from_currency == to_currency:
             return amount
 
-        # Конвертируем через RUB
-        amount_in_rub = amount * cls.RATES[from_currency]
-        result = amount_in_rub / cls.RATES[to_currency]
-        return round(result, 2)
+        return round(amount * cls._CROSS_RATES[from_currency, to_currency], 2)
+
+    @classmethod
+    def convert_many(
+        cls, amounts: Iterable[float], from_currency: Currency, to_currency: Currency
+    ) -> list[float]:
+        """Пакетная конвертация: курс выбирается один раз на весь пакет"""
+        if from_currency == to_currency:
+            return list(amounts)
+
+        rate = cls._CROSS_RATES[from_currency, to_currency]
+        return [round(amount * rate, 2) for amount in amounts]
 
     @classmethod
     def get_rate(cls, from_currency: Currency, to_currency: Currency) -> float:
         """Получить курс конвертации"""
-        return cls.RATES[from_currency] / cls.RATES[to_currency]
+        return cls._CROSS_RATES[from_currency, to_currency]
 
 
 # ============ Fee Calculator ============
@@ -955,142 +1705,417 @@ class FeeCalculator:
         currency: Currency,
         currency_conversion: bool = False,
     ) -> float:
-        """Расчёт комиссии"""
-        fee = 0.0
-
-        if transaction_type == TransactionType.EXTERNAL_TRANSFER:
-            fee = max(
-                amount * cls.EXTERNAL_TRANSFER_FEE_PERCENT,
-                cls.EXTERNAL_TRANSFER_MIN_FEE,
+        """Расчёт комиссии: проценты считаются точно в целых копейках"""
+        amount_minor = Money.to_minor(amount)
+        fee_minor = 0
+
+        if transaction_type is _TT_EXTERNAL_TRANSFER:
+            fee_minor = max(
+                Money.apply_rate(amount_minor, cls.EXTERNAL_TRANSFER_FEE_PERCENT),
+                Money.to_minor(cls.EXTERNAL_TRANSFER_MIN_FEE),
             )
 
         if currency_conversion:
-            fee += amount * cls.CURRENCY_CONVERSION_FEE_PERCENT
+            fee_minor += Money.apply_rate(
+                amount_minor, cls.CURRENCY_CONVERSION_FEE_PERCENT
+            )
 
-        return round(fee, 2)
+        return Money.to_major(fee_minor)
+
+    @classmethod
+    def calculate_fee_many(
+        cls,
+        transaction_types: Iterable[TransactionType],
+        amounts: Iterable[float],
+        currency_conversions: Iterable[bool] = None,
+    ) -> list[float]:
+        """Пакетный расчёт комиссий: константы читаются один раз на пакет"""
+        external = _TT_EXTERNAL_TRANSFER
+        external_percent = cls.EXTERNAL_TRANSFER_FEE_PERCENT
+        external_min_minor = Money.to_minor(cls.EXTERNAL_TRANSFER_MIN_FEE)
+        conversion_percent = cls.CURRENCY_CONVERSION_FEE_PERCENT
+        to_minor, apply_rate = Money.to_minor, Money.apply_rate
+        if currency_conversions is None:
+            currency_conversions = itertools.repeat(False)
+
+        fees = []
+        for transaction_type, amount, conversion in zip(
+            transaction_types, amounts, currency_conversions
+        ):
+            amount_minor = to_minor(amount)
+            fee_minor = 0
+            if transaction_type is external:
+                fee_minor = max(
+                    apply_rate(amount_minor, external_percent), external_min_minor
+                )
+            if conversion:
+                fee_minor += apply_rate(amount_minor, conversion_percent)
+            fees.append(fee_minor / 100)
+        return fees
 
 
 # ============ Transaction Processor ============
+class TransactionOutcome(Enum):
+    OK = "ok"
+    RETRY = "retry"
+    FAIL = "fail"
+
+
+@dataclass(slots=True, frozen=True)
+class TransactionResult:
+    """Итог одной попытки обработки транзакции"""
+
+    outcome: TransactionOutcome
+    error: Optional[str] = None
+    code: Optional[FailureReason] = None
+
+
+_TX_OK = TransactionResult(TransactionOutcome.OK)
+_TXO_RETRY = TransactionOutcome.RETRY
+_TXO_FAIL = TransactionOutcome.FAIL
+
+_FAILURE_BY_ERROR: dict[type[BankError], FailureReason] = {
+    InsufficientFundsError: FailureReason.INSUFFICIENT_FUNDS,
+    AccountFrozenError: FailureReason.ACCOUNT_FROZEN,
+    AccountClosedError: FailureReason.ACCOUNT_CLOSED,
+}
+# Итоги неизменяемы — отказ по статусу счёта не создаёт новых объектов
+_STATUS_FAILURES: dict[AccountStatus, TransactionResult] = {
+    status: TransactionResult(_TXO_FAIL, error.default_message, _FAILURE_BY_ERROR[error])
+    for status, error in _STATUS_ERRORS.items()
+}
+
+
 class TransactionProcessor:
     """Обработчик транзакций с повторами и логированием"""
 
-    def __init__(self, bank: "Bank", max_retries: int = 3):
+    def __init__(
+        self,
+        bank: "Bank",
+        max_retries: int = 3,
+        logger: logging.Logger = None,
+        verbose: bool = False,
+        max_failed: int = 1000,
+    ):
         self.bank = bank
         self.max_retries = max_retries
-        self.failed_transactions: list[Transaction] = []
+        # Успешные операции пишутся только в verbose-режиме; отказы и повторы — всегда
+        self.logger = logger or logging.getLogger(__name__)
+        self.verbose = verbose
+        # Кольцевой буфер: при переполнении вытесняются самые старые отказы
+        self.failed_transactions: deque[Transaction] = deque(maxlen=max_failed)
+        self._handlers: dict[TransactionType, Callable[[Transaction], TransactionResult]] = {
+            _TT_DEPOSIT: self._process_deposit,
+            _TT_WITHDRAWAL: self._process_withdrawal,
+            _TT_TRANSFER: self._process_transfer,
+            _TT_EXTERNAL_TRANSFER: self._process_external_transfer,
+        }
 
     def process_transaction(self, transaction: Transaction) -> bool:
         """Обработать транзакцию с повторами"""
+        handler = self._handlers.get(transaction.transaction_type)
+        if handler is None:
+            # Неизвестный тип не исправится повтором
+            transaction.mark_failed(
+                f"Unsupported transaction type: {transaction.transaction_type!r}",
+                FailureReason.UNSUPPORTED_TYPE,
+            )
+            self.failed_transactions.append(transaction)
+            self.logger.warning(
+                "❌ Транзакция %s отклонена: неизвестный тип", transaction.transaction_id
+            )
+            return False
+
         attempts = 0
 
         while attempts < self.max_retries:
-            try:
-                if transaction.transaction_type == TransactionType.DEPOSIT:
-                    self._process_deposit(transaction)
-                elif transaction.transaction_type == TransactionType.WITHDRAWAL:
-                    self._process_withdrawal(transaction)
-                elif transaction.transaction_type == TransactionType.TRANSFER:
-                    self._process_transfer(transaction)
-                elif transaction.transaction_type == TransactionType.EXTERNAL_TRANSFER:
-                    self._process_external_transfer(transaction)
-
-                transaction.mark_completed()
-                print(f"✅ Транзакция {transaction.transaction_id} выполнена успешно")
-                return True
+            result = self._attempt(handler, transaction)
+            outcome = result.outcome
 
-            except (
-                InsufficientFundsError,
-                AccountFrozenError,
-                AccountClosedError,
-            ) as e:
+            if outcome is _TXO_FAIL:
                 # Критические ошибки — не повторяем
-                transaction.mark_failed(str(e))
+                transaction.mark_failed(result.error, result.code)
                 self.failed_transactions.append(transaction)
-                print(f"❌ Транзакция {transaction.transaction_id} отклонена: {e}")
+                self.logger.warning(
+                    "❌ Транзакция %s отклонена: %s",
+                    transaction.transaction_id,
+                    result.error,
+                )
                 return False
 
-            except Exception as e:
+            elif outcome is _TXO_RETRY:
                 attempts += 1
                 if attempts >= self.max_retries:
-                    transaction.mark_failed(f"Max retries exceeded: {e}")
+                    transaction.mark_failed(
+                        f"Max retries exceeded: {result.error}",
+                        result.code or FailureReason.RETRIES_EXCEEDED,
+                    )
                     self.failed_transactions.append(transaction)
-                    print(
-                        f"❌ Транзакция {transaction.transaction_id} не выполнена после {attempts} попыток"
+                    self.logger.warning(
+                        "❌ Транзакция %s не выполнена после %s попыток",
+                        transaction.transaction_id,
+                        attempts,
                     )
                     return False
                 else:
-                    print(
-                        f"⚠️ Попытка {attempts}/{self.max_retries} для транзакции {transaction.transaction_id}"
+                    self.logger.warning(
+                        "⚠️ Попытка %s/%s для транзакции %s",
+                        attempts,
+                        self.max_retries,
+                        transaction.transaction_id,
+                    )
+
+            else:
+                transaction.mark_completed()
+                if self.verbose:
+                    self.logger.info(
+                        "✅ Транзакция %s выполнена успешно", transaction.transaction_id
                     )
+                return True
 
         return False
 
-    def _process_deposit(self, transaction: Transaction) -> None:
+    @staticmethod
+    def _attempt(
+        handler: Callable[[Transaction], TransactionResult], transaction: Transaction
+    ) -> TransactionResult:
+        """Одна попытка; исключения из операций счетов переводятся в итог"""
+        try:
+            return handler(transaction)
+        except (
+            InsufficientFundsError,
+            AccountFrozenError,
+            AccountClosedError,
+        ) as e:
+            return TransactionResult(_TXO_FAIL, str(e), _FAILURE_BY_ERROR[type(e)])
+        except Exception as e:
+            return TransactionResult(_TXO_RETRY, str(e))
+
+    def process_batch(self, transactions: Iterable[Transaction]) -> list[bool]:
+        """Обработать пакет транзакций; результаты в порядке входа"""
+        results: list[bool] = []
+        deposits: list[Transaction] = []
+
+        for transaction in transactions:
+            if transaction.transaction_type is _TT_DEPOSIT:
+                deposits.append(transaction)
+                continue
+            # Порядок относительно снятий и переводов сохраняется
+            if deposits:
+                results.extend(self._process_deposit_run(deposits))
+                deposits = []
+            results.append(self.process_transaction(transaction))
+
+        if deposits:
+            results.extend(self._process_deposit_run(deposits))
+        return results
+
+    def process_batch_parallel(
+        self, transactions: Iterable[Transaction], workers: int = 4
+    ) -> list[bool]:
+        """Параллельная обработка пакета; результаты в порядке входа"""
+        transactions = list(transactions)
+        results = [False] * len(transactions)
+        segment: list[int] = []
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for index, transaction in enumerate(transactions):
+                if transaction.transaction_type is _TT_TRANSFER:
+                    # Перевод затрагивает два счёта — выполняем его между сегментами
+                    self._run_partitioned(executor, transactions, segment, results, workers)
+                    segment = []
+                    results[index] = self.process_transaction(transaction)
+                else:
+                    segment.append(index)
+            self._run_partitioned(executor, transactions, segment, results, workers)
+
+        return results
+
+    def _run_partitioned(
+        self,
+        executor: ThreadPoolExecutor,
+        transactions: list[Transaction],
+        indexes: list[int],
+        results: list[bool],
+        workers: int,
+    ) -> None:
+        """Распределить транзакции по потокам: все операции счёта — в одном потоке"""
+        if not indexes:
+            return
+
+        buckets: list[list[int]] = [[] for _ in range(workers)]
+        for index in indexes:
+            transaction = transactions[index]
+            account_id = transaction.sender_account_id or transaction.receiver_account_id
+            buckets[hash(account_id) % workers].append(index)
+
+        def run(bucket: list[int]) -> None:
+            for index in bucket:
+                results[index] = self.process_transaction(transactions[index])
+
+        futures = [executor.submit(run, bucket) for bucket in buckets if bucket]
+        for future in futures:
+            future.result()
+
+    def _process_deposit_run(self, deposits: list[Transaction]) -> list[bool]:
+        """Зачислить подряд идущие пополнения группами по счёту получателя"""
+        groups: dict[str, list[int]] = {}
+        for index, transaction in enumerate(deposits):
+            groups.setdefault(transaction.receiver_account_id, []).append(index)
+
+        accounts = self.bank.accounts
+        results = [False] * len(deposits)
+        completed = 0
+
+        for account_id, indexes in groups.items():
+            group = [deposits[index] for index in indexes]
+            account = accounts.get(account_id)
+            try:
+                if account is None:
+                    raise InvalidOperationError("Account not found")
+                # deposit_many проверяет всю группу до изменения баланса
+                account.deposit_many([transaction.amount for transaction in group])
+            except BankError:
+                # Группа не прошла проверку — обрабатываем поштучно с повторами
+                for index, transaction in zip(indexes, group):
+                    results[index] = self.process_transaction(transaction)
+                continue
+
+            for index, transaction in zip(indexes, group):
+                transaction.mark_completed()
+                results[index] = True
+            completed += len(group)
+
+        if completed and self.verbose:
+            self.logger.info("✅ Пакетно зачислено пополнений: %s", completed)
+        return results
+
+    def _process_deposit(self, transaction: Transaction) -> TransactionResult:
         """Обработать пополнение"""
-        account = self.bank.accounts.get(transaction.receiver_account_id)
-        if not account:
-            raise InvalidOperationError("Account not found")
+        try:
+            account = self.bank.accounts[transaction.receiver_account_id]
+        except KeyError:
+            return TransactionResult(
+                _TXO_RETRY, "Account not found", FailureReason.ACCOUNT_NOT_FOUND
+            )
 
-        account.deposit(transaction.amount)
+        AmountValidator.validate(transaction.amount)
+        failure = _STATUS_FAILURES.get(account.status)
+        if failure is not None:
+            return failure
+        with account._lock:
+            account._deposit_unchecked(transaction.amount)
+        return _TX_OK
 
-    def _process_withdrawal(self, transaction: Transaction) -> None:
+    def _process_withdrawal(self, transaction: Transaction) -> TransactionResult:
         """Обработать снятие"""
-        account = self.bank.accounts.get(transaction.sender_account_id)
-        if not account:
-            raise InvalidOperationError("Account not found")
+        try:
+            account = self.bank.accounts[transaction.sender_account_id]
+        except KeyError:
+            return TransactionResult(
+                _TXO_RETRY, "Account not found", FailureReason.ACCOUNT_NOT_FOUND
+            )
 
-        AccountStatusValidator.validate_for_operation(account.status)
-        account.withdraw(transaction.get_total_amount())  # С учётом комиссии
+        AmountValidator.validate(transaction.amount)
+        failure = _STATUS_FAILURES.get(account.status)
+        if failure is not None:
+            return failure
+        with account._lock:
+            account._withdraw_unchecked(transaction.get_total_amount())  # С учётом комиссии
+        return _TX_OK
 
-    def _process_transfer(self, transaction: Transaction) -> None:
+    def _process_transfer(self, transaction: Transaction) -> TransactionResult:
         """Обработать внутренний перевод"""
-        sender = self.bank.accounts.get(transaction.sender_account_id)
-        receiver = self.bank.accounts.get(transaction.receiver_account_id)
-
-        if not sender or not receiver:
-            raise InvalidOperationError("One or both accounts not found")
+        accounts = self.bank.accounts
+        try:
+            sender = accounts[transaction.sender_account_id]
+            receiver = accounts[transaction.receiver_account_id]
+        except KeyError:
+            return TransactionResult(
+                _TXO_RETRY, "One or both accounts not found", FailureReason.ACCOUNT_NOT_FOUND
+            )
 
-        # Проверки
-        AccountStatusValidator.validate_for_operation(sender.status)
-        AccountStatusValidator.validate_for_operation(receiver.status)
+        amount = transaction.amount
+        total = transaction.get_total_amount()
 
-        # Проверка баланса (кроме премиум с овердрафтом)
-        if not isinstance(sender, PremiumAccount):
-            if sender.balance < transaction.get_total_amount():
-                raise InsufficientFundsError("Insufficient funds for transfer")
+        # Проверки выполняются один раз; дальше — непроверяющие операции счетов
+        AmountValidator.validate(amount)
+        failure = _STATUS_FAILURES.get(sender.status) or _STATUS_FAILURES.get(
+            receiver.status
+        )
+        if failure is not None:
+            return failure
+
+        # Счета блокируются по очереди, а не вложенно — взаимная блокировка невозможна
+        with sender._lock:
+            # Проверка баланса (кроме премиум с овердрафтом)
+            if not sender.has_overdraft and sender.balance < total:
+                return TransactionResult(
+                    _TXO_FAIL,
+                    "Insufficient funds for transfer",
+                    FailureReason.INSUFFICIENT_FUNDS,
+                )
+
+            # Конвертация валюты при необходимости
+            sender_currency = sender.currency
+            receiver_currency = receiver.currency
+            if sender_currency != receiver_currency:
+                converted_amount = CurrencyConverter.convert(
+                    amount, sender_currency, receiver_currency
+                )
+                # После округления до копеек сумма может обнулиться
+                AmountValidator.validate(converted_amount)
+            else:
+                converted_amount = amount
 
-        # Конвертация валюты при необходимости
-        if sender.currency != receiver.currency:
-            converted_amount = CurrencyConverter.convert(
-                transaction.amount, sender.currency, receiver.currency
-            )
-        else:
-            converted_amount = transaction.amount
+            sender._withdraw_unchecked(total)
 
-        # Выполнение перевода
-        sender.withdraw(transaction.get_total_amount())
-        receiver.deposit(converted_amount)
+        with receiver._lock:
+            receiver._deposit_unchecked(converted_amount)
+        return _TX_OK
 
-    def _process_external_transfer(self, transaction: Transaction) -> None:
+    def _process_external_transfer(self, transaction: Transaction) -> TransactionResult:
         """Обработать внешний перевод"""
-        sender = self.bank.accounts.get(transaction.sender_account_id)
-
-        if not sender:
-            raise InvalidOperationError("Sender account not found")
+        try:
+            sender = self.bank.accounts[transaction.sender_account_id]
+        except KeyError:
+            return TransactionResult(
+                _TXO_RETRY, "Sender account not found", FailureReason.ACCOUNT_NOT_FOUND
+            )
 
-        AccountStatusValidator.validate_for_operation(sender.status)
+        amount = transaction.amount
+        AmountValidator.validate(amount)
+        failure = _STATUS_FAILURES.get(sender.status)
+        if failure is not None:
+            return failure
 
         # Внешний перевод — только списание
-        total = transaction.get_total_amount()
-        if not isinstance(sender, PremiumAccount):
-            if sender.balance < total:
-                raise InsufficientFundsError("Insufficient funds for external transfer")
-
-        sender.withdraw(total)
+        total = amount + transaction.fee
+        with sender._lock:
+            if not sender.has_overdraft and sender.balance < total:
+                return TransactionResult(
+                    _TXO_FAIL,
+                    "Insufficient funds for external transfer",
+                    FailureReason.INSUFFICIENT_FUNDS,
+                )
+            sender._withdraw_unchecked(total)
+        return _TX_OK
 
     def get_failed_transactions(self) -> list[Transaction]:
         """Получить список неудачных транзакций"""
-        return self.failed_transactions
+        return list(self.failed_transactions)
+
+    def drain_failed(self) -> list[Transaction]:
+        """Забрать накопленные неудачные транзакции и очистить буфер"""
+        drained = []
+        failed = self.failed_transactions
+        # popleft атомарен: отказы, добавленные во время выгрузки, не теряются
+        try:
+            while True:
+                drained.append(failed.popleft())
+        except IndexError:
+            pass
+        return drained
 
 
 # ============ Transaction Factory ============
@@ -1106,7 +2131,7 @@ class TransactionFactory:
     ) -> Transaction:
         """Создать транзакцию пополнения"""
         return Transaction(
-            transaction_id=UUIDGenerator.generate()[:8],
+            transaction_id=UUIDGenerator.generate_short(),
             transaction_type=TransactionType.DEPOSIT,
             amount=amount,
             currency=currency,
@@ -1126,7 +2151,7 @@ class TransactionFactory:
         fee = FeeCalculator.calculate_fee(TransactionType.TRANSFER, amount, currency)
 
         return Transaction(
-            transaction_id=UUIDGenerator.generate()[:8],
+            transaction_id=UUIDGenerator.generate_short(),
             transaction_type=TransactionType.TRANSFER,
             amount=amount,
             currency=currency,
@@ -1149,7 +2174,7 @@ class TransactionFactory:
         )
 
         return Transaction(
-            transaction_id=UUIDGenerator.generate()[:8],
+            transaction_id=UUIDGenerator.generate_short(),
             transaction_type=TransactionType.EXTERNAL_TRANSFER,
             amount=amount,
             currency=currency,
@@ -1,16 +1,28 @@
-print("Тесты запускаются...")
 import unittest
+import gc
+import logging
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from fractions import Fraction
+import io
 import sys
 import os
+import subprocess
+import tempfile
+from datetime import date, datetime
+from typing import NamedTuple
+from unittest.mock import patch
 
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-src_dir = os.path.join(parent_dir, "src")
-sys.path.insert(0, src_dir)
+# src/ рядом с tests/ — модуль main импортируется без установки пакета
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
 
 from main import (
+    AbstractAccount,
     BankAccount,
     AccountType,
     AccountStatus,
@@ -19,7 +31,13 @@ from main import (
     AccountFrozenError,
     AccountClosedError,
     InvalidOperationError,
+    BankError,
     TransactionLogger,
+    ConsoleLogger,
+    DebugLogger,
+    NullLogger,
+    FileLogger,
+    UUIDGenerator,
     InvestmentAccount,
     PremiumAccount,
     SavingsAccount,
@@ -32,205 +50,271 @@ from main import (
     TransactionType,
     TransactionStatus,
     TransactionPriority,
+    TransactionOutcome,
     TransactionQueue,
     TransactionProcessor,
     TransactionFactory,
+    FailureReason,
     CurrencyConverter,
     FeeCalculator,
 )
 
 
+class LogEntry(NamedTuple):
+    """Запись MockLogger: сумма операции и баланс после неё"""
+
+    amount: float
+    balance: float
+
+
 class MockLogger(TransactionLogger):
     """Mock-логгер для тестирования"""
 
     def __init__(self):
         self.deposits = []
         self.withdrawals = []
+        self.events = []
 
     def log_deposit(self, amount: float, balance: float) -> None:
-        self.deposits.append({"amount": amount, "balance": balance})
+        self.deposits.append(LogEntry(amount, balance))
 
     def log_withdrawal(self, amount: float, balance: float) -> None:
-        self.withdrawals.append({"amount": amount, "balance": balance})
+        self.withdrawals.append(LogEntry(amount, balance))
+
+    def log_event(self, message: str) -> None:
+        self.events.append(message)
+
+    def reset(self) -> None:
+        """Очистить накопленные записи для повторного использования"""
+        self.deposits.clear()
+        self.withdrawals.clear()
+        self.events.clear()
+
+
+def make_account(account_class=BankAccount, **overrides):
+    """Счёт с типовыми владельцем, типом и валютой; возвращает (счёт, MockLogger)"""
+    params = {
+        "first_last_name": "Test User",
+        "account_type": AccountType.INDIVIDUAL,
+        "currency": Currency.RUB,
+        "logger": MockLogger(),
+    }
+    params.update(overrides)
+    return account_class(**params), params["logger"]
+
+
+class DaytimeClock:
+    """Часы с фиксированным дневным часом вместо CoarseClock"""
+
+    def hour(self) -> int:
+        return 12
+
 
+def make_bank() -> Bank:
+    """Банк вне ночного запрета 00:00–05:00: результат не зависит от времени запуска"""
+    return Bank(clock=DaytimeClock())
 
-class TestBankAccount(unittest.TestCase):
+
+# Общий лот на 1500: тесты, которые меняют цену или количество, создают свой
+AAPL_LOT = Stock("AAPL", 10, 150)
+
+
+class SharedLoggerTestCase(unittest.TestCase):
+    """Базовый TestCase с общим MockLogger для тестов, не проверяющих журнал"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.logger = MockLogger()
+
+    def setUp(self):
+        self.logger.reset()
+
+
+class TestBankAccount(SharedLoggerTestCase):
     """Тесты для класса BankAccount"""
 
     def test_deposit_success(self):
         """Тест успешного пополнения и снятия"""
-        mock_logger = MockLogger()
-        account = BankAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            logger=mock_logger,
-        )
+        account, _ = make_account(BankAccount, balance=1000, logger=self.logger)
         account.deposit(500)
         account.withdraw(500)
         self.assertEqual(account.balance, 1000)
 
-    def test_withdraw_frozen_account(self):
-        """Тест снятия с замороженного счёта - должно вызвать исключение"""
-        mock_logger = MockLogger()
-        account = BankAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            status=AccountStatus.FROZEN,
-            logger=mock_logger,
-        )
-
-        with self.assertRaises(AccountFrozenError):
-            account.withdraw(500)
-
-    def test_deposit_frozen_account(self):
-        """Тест пополнения замороженного счёта - должно вызвать исключение"""
-        mock_logger = MockLogger()
-        account = BankAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            status=AccountStatus.FROZEN,
-            logger=mock_logger,
-        )
-
-        with self.assertRaises(AccountFrozenError):
-            account.deposit(500)
-
     def test_insufficient_funds(self):
         """Тест снятия суммы больше баланса"""
-        mock_logger = MockLogger()
-        account = BankAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            logger=mock_logger,
-        )
+        account, _ = make_account(BankAccount, balance=1000, logger=self.logger)
 
         with self.assertRaises(InsufficientFundsError):
             account.withdraw(1500)
 
-    def test_invalid_amount_deposit(self):
-        """Тест пополнения с невалидной суммой"""
-        mock_logger = MockLogger()
-        account = BankAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            logger=mock_logger,
-        )
+    def test_invalid_amounts(self):
+        """Тест пополнения и снятия с невалидной суммой"""
+        account, _ = make_account(BankAccount, balance=1000, logger=self.logger)
 
-        with self.assertRaises(InvalidOperationError):
-            account.deposit("invalid")
+        for operation in ("deposit", "withdraw"):
+            for amount in ("invalid", None, True, -100, 0, 0.0, -50, float("inf")):
+                with self.subTest(operation=operation, amount=amount):
+                    with self.assertRaises(InvalidOperationError):
+                        getattr(account, operation)(amount)
 
-        with self.assertRaises(InvalidOperationError):
-            account.deposit(-100)
+        self.assertEqual(account.balance, 1000)
 
-    def test_invalid_amount_withdraw(self):
-        """Тест снятия с невалидной суммой"""
-        mock_logger = MockLogger()
-        account = BankAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            logger=mock_logger,
-        )
+    def test_sub_kopeck_amounts(self):
+        """Тест: суммы меньше копейки отклоняются и не попадают в журнал"""
+        account, mock_logger = make_account(BankAccount, balance=1000)
 
-        with self.assertRaises(InvalidOperationError):
-            account.withdraw(0)
+        for operation in ("deposit", "withdraw", "deposit_many"):
+            for amount in (0.004, 0.005, Fraction(1, 300)):
+                with self.subTest(operation=operation, amount=amount):
+                    args = [amount] if operation == "deposit_many" else amount
+                    with self.assertRaises(InvalidOperationError):
+                        getattr(account, operation)(args)
 
-        with self.assertRaises(InvalidOperationError):
-            account.withdraw(-50)
+        self.assertEqual(account.balance, 1000)
+        self.assertEqual(mock_logger.deposits, [])
+        self.assertEqual(mock_logger.withdrawals, [])
 
-    def test_closed_account_operations(self):
-        """Тест операций с закрытым счётом"""
-        mock_logger = MockLogger()
-        account = BankAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            status=AccountStatus.CLOSED,
-            logger=mock_logger,
-        )
+        account.deposit(0.006)
+        self.assertEqual(account.balance, 1000.01)
 
-        with self.assertRaises(AccountClosedError):
-            account.deposit(100)
+    def test_amount_numeric_types(self):
+        """Тест: принимаются числовые типы, совместимые с float-балансом"""
+        account, _ = make_account(BankAccount, balance=1000, logger=self.logger)
+
+        account.deposit(Fraction(1, 2))
+        self.assertEqual(account.balance, 1000.5)
 
-        with self.assertRaises(AccountClosedError):
-            account.withdraw(100)
+        with self.assertRaises(InvalidOperationError):
+            account.deposit(float("nan"))
 
     def test_negative_balance_init(self):
         """Тест создания счёта с отрицательным балансом"""
-        mock_logger = MockLogger()
-
         with self.assertRaises(InsufficientFundsError):
-            BankAccount(
-                first_last_name="Test User",
-                account_type=AccountType.INDIVIDUAL,
-                currency=Currency.RUB,
-                balance=-100,
-                logger=mock_logger,
-            )
+            make_account(BankAccount, balance=-100, logger=self.logger)
+
+    def test_non_finite_balance_init(self):
+        """Тест создания счёта с бесконечным или NaN балансом"""
+        for balance in (float("inf"), float("nan")):
+            with self.subTest(balance=balance):
+                with self.assertRaises(InvalidOperationError):
+                    make_account(BankAccount, balance=balance, logger=self.logger)
+        with self.assertRaises(InsufficientFundsError):
+            make_account(BankAccount, balance=float("-inf"), logger=self.logger)
 
     def test_get_account_info(self):
         """Тест получения информации о счёте"""
-        mock_logger = MockLogger()
-        account = BankAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            logger=mock_logger,
-        )
+        account, _ = make_account(BankAccount, balance=1000, logger=self.logger)
 
         info = account.get_account_info()
 
-        self.assertEqual(info["owner"], "Test User")
-        self.assertEqual(info["currency"], "RUB")
-        self.assertEqual(info["balance"], 1000)
-        self.assertEqual(info["status"], "active")
-        self.assertEqual(info["type"], "FL")
+        expected = {
+            "owner": "Test User",
+            "currency": "RUB",
+            "balance": 1000,
+            "status": "active",
+            "type": "FL",
+        }
+        self.assertEqual({key: info[key] for key in expected}, expected)
         self.assertIn("uuid", info)
 
+    def test_get_account_info_reflects_changes(self):
+        """Тест: информация о счёте актуальна после изменений"""
+        account, _ = make_account(BankAccount, balance=1000, logger=self.logger)
+
+        first = account.get_account_info()
+        first["owner"] = "Changed"
+        account.deposit(500)
+        account.first_last_name = "New Owner"
+        account.status = AccountStatus.FROZEN
+        second = account.get_account_info()
+
+        self.assertEqual(second["owner"], "New Owner")
+        self.assertEqual(second["balance"], 1500)
+        self.assertEqual(second["status"], "frozen")
+        self.assertEqual(list(second), ["uuid", "owner", "type", "currency", "balance", "status"])
+
+    def test_invalid_currency_and_type(self):
+        """Тест создания счёта с неподдерживаемыми валютой и типом"""
+        with self.assertRaises(InvalidOperationError):
+            make_account(BankAccount, currency="GBP", logger=self.logger)
+
+        with self.assertRaises(InvalidOperationError):
+            make_account(BankAccount, account_type="XX", logger=self.logger)
+
+    def test_balance_kept_in_minor_units(self):
+        """Тест: баланс считается в копейках без накопления ошибки float"""
+        account, mock_logger = make_account(BankAccount)
+
+        for _ in range(10):
+            account.deposit(0.1)
+        self.assertEqual(account.balance, 1.0)
+
+        account.withdraw(0.3)
+        self.assertEqual(account.balance, 0.7)
+        self.assertEqual(mock_logger.withdrawals[-1].balance, 0.7)
+
+    def test_str_reflects_changes(self):
+        """Тест: кэш __str__ обновляется при изменении баланса и статуса"""
+        account, _ = make_account(BankAccount, balance=1000, logger=self.logger)
+
+        self.assertIn("Баланс: 1000", str(account))
+        self.assertIs(str(account), str(account))
+
+        account.deposit(500)
+        self.assertIn("Баланс: 1500", str(account))
+
+        account.status = AccountStatus.FROZEN
+        self.assertIn("Статус: frozen", str(account))
+
+    def test_currency_and_type_reassigned(self):
+        """Тест: информация и строка счёта учитывают новые валюту и тип"""
+        for account_class, extra in (
+            (BankAccount, {}),
+            (SavingsAccount, {"monthly_interest_rate": 0.01}),
+            (PremiumAccount, {}),
+            (InvestmentAccount, {}),
+        ):
+            with self.subTest(account_class=account_class.__name__):
+                account, _ = make_account(account_class, logger=self.logger, **extra)
+                account.get_account_info()
+                str(account)
+
+                account.currency = Currency.USD
+                account.account_type = AccountType.LEGAL
+                info = account.get_account_info()
+
+                self.assertEqual((info["currency"], info["type"]), ("USD", "UL"))
+                self.assertIn("USD", str(account))
+                self.assertNotIn("RUB", str(account))
+
     def test_uuid_generation(self):
-        """Тест автоматической генерации UUID"""
-        mock_logger = MockLogger()
-        account1 = BankAccount(
-            first_last_name="User1",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            logger=mock_logger,
-        )
+        """Тест: каждый новый счёт получает уникальный UUID"""
+        uuids = {
+            BankAccount(
+                f"User{i}", AccountType.INDIVIDUAL, Currency.RUB, 1000, logger=self.logger
+            ).account_uuid
+            for i in range(16)
+        }
 
-        account2 = BankAccount(
-            first_last_name="User2",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            logger=mock_logger,
-        )
+        self.assertEqual(len(uuids), 16)
 
-        self.assertNotEqual(account1.account_uuid, account2.account_uuid)
+    def test_uuid_generate_many(self):
+        """Тест пакетной генерации UUID"""
+        uuids = UUIDGenerator.generate_many(100)
+
+        self.assertEqual(len(uuids), 100)
+        self.assertEqual(len(set(uuids)), 100)
+        self.assertTrue(all(len(value) == 32 for value in uuids))
+
+    def test_uuid_generate_short(self):
+        """Тест генерации коротких идентификаторов"""
+        self.assertEqual(len(UUIDGenerator.generate_short()), 8)
+        self.assertEqual(len(UUIDGenerator.generate_short(5)), 5)
+        int(UUIDGenerator.generate_short(), 16)  # только hex-символы
 
     def test_balance_property(self):
         """Тест свойства balance"""
-        mock_logger = MockLogger()
-        account = BankAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            logger=mock_logger,
-        )
+        account, _ = make_account(BankAccount, balance=1000, logger=self.logger)
 
         self.assertEqual(account.balance, 1000)
         account.deposit(500)
@@ -238,50 +322,31 @@ class TestBankAccount(unittest.TestCase):
 
     def test_legal_account_type(self):
         """Тест создания счёта юридического лица"""
-        mock_logger = MockLogger()
         account = BankAccount(
             first_last_name="ООО Рога и Копыта",
             account_type=AccountType.LEGAL,
             currency=Currency.USD,
             balance=5000,
-            logger=mock_logger,
+            logger=self.logger,
         )
 
         info = account.get_account_info()
-        self.assertEqual(info["type"], "UL")
-        self.assertEqual(info["currency"], "USD")
+        expected = {"type": "UL", "currency": "USD"}
+        self.assertEqual({key: info[key] for key in expected}, expected)
 
     def test_different_currencies(self):
         """Тест создания счетов с разными валютами"""
-        mock_logger = MockLogger()
-        currencies = [
-            Currency.RUB,
-            Currency.USD,
-            Currency.EUR,
-            Currency.KZT,
-            Currency.CNY,
-        ]
-
-        for currency in currencies:
-            account = BankAccount(
-                first_last_name="Test User",
-                account_type=AccountType.INDIVIDUAL,
-                currency=currency,
-                balance=1000,
-                logger=mock_logger,
-            )
-            self.assertEqual(account.currency, currency)
+        for currency in Currency:
+            with self.subTest(currency=currency):
+                account, _ = make_account(
+                    BankAccount, currency=currency, balance=1000, logger=self.logger
+                )
+                self.assertIs(account.currency, currency)
+                self.assertEqual(account.get_account_info()["currency"], currency.value)
 
     def test_multiple_transactions_logging(self):
         """Тест логирования нескольких транзакций"""
-        mock_logger = MockLogger()
-        account = BankAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            logger=mock_logger,
-        )
+        account, mock_logger = make_account(BankAccount, balance=1000)
 
         account.deposit(500)
         account.withdraw(200)
@@ -291,253 +356,475 @@ class TestBankAccount(unittest.TestCase):
         self.assertEqual(len(mock_logger.withdrawals), 1)
         self.assertEqual(account.balance, 1400)
 
-    def test_frozen_account_no_logging(self):
-        """Тест: замороженный счёт не логирует операции"""
-        mock_logger = MockLogger()
+    def test_deposit_many(self):
+        """Тест пакетного пополнения"""
+        account, mock_logger = make_account(BankAccount, balance=1000)
+
+        account.deposit_many([100, 200, 300])
+
+        self.assertEqual(account.balance, 1600)
+        self.assertEqual(len(mock_logger.deposits), 3)
+        self.assertEqual(mock_logger.deposits[-1].balance, 1600)
+
+    def test_deposit_many_null_logger(self):
+        """Тест пакетного пополнения с отключённым логированием"""
+        account, _ = make_account(BankAccount, balance=1000, logger=NullLogger())
+
+        account.deposit_many([0.1, 0.2, 100])
+        account.withdraw(0.3)
+
+        self.assertEqual(account.balance, 1100)
+
+    def test_deposit_many_invalid_amount(self):
+        """Тест: невалидная сумма в пакете отменяет весь пакет"""
+        account, mock_logger = make_account(BankAccount, balance=1000)
+
+        with self.assertRaises(InvalidOperationError):
+            account.deposit_many([100, -5])
+
+        self.assertEqual(account.balance, 1000)
+        self.assertEqual(len(mock_logger.deposits), 0)
+
+    def test_fast_deposit(self):
+        """Тест быстрых зачислений с отложенным flush"""
+        account, mock_logger = make_account(BankAccount, balance=1000)
+
+        fast_deposit, flush = account.make_fast_deposit()
+        fast_deposit(100)
+        fast_deposit(0.1)
+        fast_deposit(0.2)
+        for amount in (-5, 0.004, "10", None, float("nan"), True):
+            with self.subTest(amount=amount):
+                with self.assertRaises(InvalidOperationError):
+                    fast_deposit(amount)
+        self.assertEqual(account.balance, 1000)
+
+        account.status = AccountStatus.FROZEN
+        with self.assertRaises(AccountFrozenError):
+            flush()
+        account.status = AccountStatus.ACTIVE
+
+        flush()
+        flush()
+        self.assertEqual(account.balance, 1100.3)
+        self.assertEqual(len(mock_logger.deposits), 1)
+
+    def test_string_codes_coerced_to_enums(self):
+        """Тест: строковые коды приводятся к членам StrEnum"""
         account = BankAccount(
             first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            balance=1000,
-            status=AccountStatus.FROZEN,
-            logger=mock_logger,
+            account_type="FL",
+            currency="USD",
+            status="frozen",
+            logger=self.logger,
         )
 
+        self.assertIs(account.account_type, AccountType.INDIVIDUAL)
+        self.assertIs(account.currency, Currency.USD)
+        self.assertIs(account.status, AccountStatus.FROZEN)
+        self.assertEqual(AccountStatus.ACTIVE, "active")
+        self.assertIn("Статус: frozen", str(account))
         with self.assertRaises(AccountFrozenError):
+            account.deposit(100)
+        with self.assertRaises(InvalidOperationError):
+            BankAccount("Test User", AccountType.INDIVIDUAL, "XYZ")
+
+    def test_default_logger_shared(self):
+        """Тест: счета без логгера используют общий ConsoleLogger"""
+        first = BankAccount("User One", AccountType.INDIVIDUAL, Currency.RUB)
+        second = SavingsAccount("User Two", AccountType.INDIVIDUAL, Currency.RUB, 0.01)
+
+        self.assertIsInstance(first._logger, ConsoleLogger)
+        self.assertIs(first._logger, second._logger)
+
+    def test_console_logger_output(self):
+        """Тест: ConsoleLogger пишет все записи в текущий sys.stdout"""
+        logger = ConsoleLogger()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            logger.log_deposit(500, 1500)
+            logger.log_withdrawal(200, 1300)
+            logger.log_event("Счёт заморожен")
+
+        self.assertEqual(
+            output.getvalue(),
+            "Внесено: 500\nНа счету: 1500\nСнято: 200\nНа счету: 1300\nСчёт заморожен\n",
+        )
+
+    def test_debug_logger(self):
+        """Тест ленивого DebugLogger"""
+        account, _ = make_account(
+            BankAccount,
+            balance=1000,
+            logger=DebugLogger("tests.debug_logger"),
+        )
+
+        with self.assertLogs("tests.debug_logger", level="DEBUG") as captured:
             account.deposit(500)
+            account.withdraw(200)
 
-        with self.assertRaises(AccountFrozenError):
+        self.assertEqual(
+            captured.output,
+            [
+                "DEBUG:tests.debug_logger:Deposit: 500, New balance: 1500.0",
+                "DEBUG:tests.debug_logger:Withdrawal: 200, New balance: 1300.0",
+            ],
+        )
+
+    def test_file_logger_flushes_on_close(self):
+        """Тест: FileLogger дописывает записи из очереди при закрытии"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "transactions.log")
+            logger = FileLogger(filename)
+            account, _ = make_account(BankAccount, balance=1000, logger=logger)
+
+            account.deposit(500)
             account.withdraw(200)
+            logger.close()
+
+            with open(filename, encoding="utf-8") as log_file:
+                content = log_file.read()
+
+        self.assertRegex(
+            content,
+            r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - INFO - "
+            r"Deposit: 500, New balance: 1500\.0\n",
+        )
+        self.assertIn("Withdrawal: 200, New balance: 1300.0", content)
+
+    def test_file_loggers_share_one_handler(self):
+        """Тест: несколько FileLogger одного файла не дублируют записи"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "transactions.log")
+            first = FileLogger(filename)
+            second = FileLogger(filename)
+
+            first.log_deposit(100, 1100)
+            second.log_withdrawal(50, 1050)
+            first.close()
+            second.log_event("still open")
+            second.close()
+
+            with open(filename, encoding="utf-8") as log_file:
+                lines = log_file.read().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].endswith("Deposit: 100, New balance: 1100"))
+        self.assertTrue(lines[2].endswith("still open"))
+
+    def test_file_loggers_flushed_at_exit(self):
+        """Тест: записи общего приёмника дописываются при выходе без close()"""
+        script = (
+            "import sys\n"
+            "sys.path.insert(0, sys.argv[1])\n"
+            "from main import FileLogger\n"
+            "first, second = FileLogger(sys.argv[2]), FileLogger(sys.argv[2])\n"
+            "for i in range(5000):\n"
+            "    first.log_deposit(i, i)\n"
+            "    second.log_withdrawal(i, i)\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "transactions.log")
+            subprocess.run([sys.executable, "-c", script, SRC_DIR, filename], check=True)
+
+            with open(filename, encoding="utf-8") as log_file:
+                lines = log_file.read().splitlines()
+
+        self.assertEqual(len(lines), 10000)
+        self.assertTrue(lines[-1].endswith("Withdrawal: 4999, New balance: 4999"))
+
+    def test_exception_hierarchy(self):
+        """Тест общей базы исключений и сообщений по умолчанию"""
+        for error_cls in (
+            InvalidOperationError,
+            InsufficientFundsError,
+            AccountClosedError,
+            AccountFrozenError,
+        ):
+            self.assertTrue(issubclass(error_cls, BankError))
+
+        self.assertEqual(str(AccountFrozenError()), "Account is frozen")
+        self.assertEqual(str(InsufficientFundsError("Custom")), "Custom")
+
+    def test_slots_and_pickling(self):
+        """Тест: счёт хранит поля в __slots__ и корректно сериализуется"""
+        account, _ = make_account(BankAccount, balance=1000, logger=ConsoleLogger())
+
+        self.assertFalse(hasattr(account, "__dict__"))
+
+        restored = pickle.loads(pickle.dumps(account))
+        self.assertEqual(restored.account_uuid, account.account_uuid)
+        self.assertEqual(restored.balance, 1000)
+        self.assertEqual(restored.status, AccountStatus.ACTIVE)
+
+    def test_abstract_account_not_instantiable(self):
+        """Тест: базовый класс счёта нельзя создать напрямую"""
+        with self.assertRaises(TypeError):
+            AbstractAccount(
+                "uuid", "Test User", 0, AccountStatus.ACTIVE, AccountType.INDIVIDUAL, Currency.RUB
+            )
 
-        # Логирование не должно произойти
-        self.assertEqual(len(mock_logger.deposits), 0)
-        self.assertEqual(len(mock_logger.withdrawals), 0)
+    def test_concurrent_withdrawals(self):
+        """Тест: параллельные снятия не уводят баланс в минус"""
+        account, _ = make_account(BankAccount, balance=1000, logger=self.logger)
+
+        def withdraw() -> bool:
+            try:
+                account.withdraw(10)
+            except InsufficientFundsError:
+                return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: withdraw(), range(200)))
+
+        self.assertEqual(results.count(True), 100)
+        self.assertEqual(account.balance, 0)
+
+        restored = pickle.loads(pickle.dumps(account))
+        restored.deposit(50)
+        self.assertEqual(restored.balance, 50)
+
+    def test_slots_on_domain_objects(self):
+        """Тест: активы, подклассы счетов, клиент и транзакция без __dict__"""
+        objects = [
+            Stock("AAPL", 1, 100),
+            Bond("OFZ", 1, 100),
+            ETF("SPY", 1, 100),
+            SavingsAccount("Saver", AccountType.INDIVIDUAL, Currency.RUB, 5000),
+            PremiumAccount("Premium", AccountType.INDIVIDUAL, Currency.RUB),
+            InvestmentAccount("Investor", AccountType.INDIVIDUAL, Currency.RUB),
+            Client("FL001", "Иван Иванов", "1990-01-01"),
+            Transaction("T1", TransactionType.DEPOSIT, 100, Currency.RUB),
+        ]
+        for obj in objects:
+            with self.subTest(cls=type(obj).__name__):
+                self.assertFalse(hasattr(obj, "__dict__"))
+
+    def test_slots_reject_ad_hoc_attributes(self):
+        """Тест: счёт и транзакция из фабрики не принимают посторонние атрибуты"""
+        account = BankAccount(
+            "Test User", AccountType.INDIVIDUAL, Currency.RUB, logger=self.logger
+        )
+        tx = TransactionFactory.create_deposit(account.account_uuid, 100, Currency.RUB)
+
+        for obj in (account, tx):
+            with self.subTest(cls=type(obj).__name__):
+                with self.assertRaises(AttributeError):
+                    obj.note = "ad hoc"
 
 
 """"""
 
 
 # ============ Тесты для SavingsAccount ============
-class TestSavingsAccount(unittest.TestCase):
+class TestSavingsAccount(SharedLoggerTestCase):
     """Тесты для класса SavingsAccount"""
 
     def test_apply_monthly_interest_success(self):
-        """Тест успешного начисления процентов"""
-        mock_logger = MockLogger()
-        account = SavingsAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            monthly_interest_rate=0.05,
-            balance=10000,
-            min_balance=1000,
-            logger=mock_logger,
-        )
-
-        initial_balance = account.balance
+        """Тест успешного начисления процентов при разных ставках"""
+        for rate in (0.01, 0.03, 0.05, 0.07, 0.10):
+            with self.subTest(rate=rate):
+                account, _ = make_account(
+                    SavingsAccount,
+                    monthly_interest_rate=rate,
+                    balance=10000,
+                    min_balance=1000,
+                    logger=self.logger,
+                )
+
+                initial_balance = account.balance
+                account.apply_monthly_interest()
+                expected_balance = initial_balance * (1 + rate)
+
+                # Баланс хранится в копейках: сравнение с точностью до копейки
+                self.assertAlmostEqual(account.balance, expected_balance, places=2)
+
+    def test_interest_exact_in_minor_units(self):
+        """Тест: проценты считаются точно в копейках, без ошибки float"""
+        account, _ = make_account(
+            SavingsAccount,
+            monthly_interest_rate=0.07,
+            balance=1.5,
+            min_balance=0,
+            logger=self.logger,
+        )
+
+        # 150 коп. * 0.07 = 10.5 коп. ровно; float даёт 10.500000000000002
         account.apply_monthly_interest()
-        expected_balance = initial_balance * 1.05
 
-        self.assertEqual(account.balance, expected_balance)
+        self.assertEqual(account.balance, 1.6)
 
     def test_withdraw_below_min_balance(self):
         """Тест снятия, нарушающего минимальный остаток"""
-        mock_logger = MockLogger()
-        account = SavingsAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
+        account, _ = make_account(
+            SavingsAccount,
             monthly_interest_rate=0.03,
             balance=5000,
             min_balance=1000,
-            logger=mock_logger,
+            logger=self.logger,
         )
 
         with self.assertRaises(InsufficientFundsError):
             account.withdraw(4500)
 
-    def test_withdraw_respecting_min_balance(self):
-        """Тест снятия с учетом минимального остатка"""
-        mock_logger = MockLogger()
-        account = SavingsAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
+    def test_min_balance_change(self):
+        """Тест: новый минимальный остаток учитывается в проверке и сообщении"""
+        account, _ = make_account(
+            SavingsAccount,
             monthly_interest_rate=0.03,
             balance=5000,
             min_balance=1000,
-            logger=mock_logger,
+            logger=self.logger,
         )
 
-        account.withdraw(4000)
-        self.assertEqual(account.balance, 1000)
+        account.min_balance = 4000
+        with self.assertRaises(InsufficientFundsError) as ctx:
+            account.withdraw(1500)
+        self.assertEqual(
+            str(ctx.exception),
+            "Withdrawal would violate minimum balance requirement of 4000",
+        )
 
-    def test_interest_on_frozen_account(self):
-        """Тест начисления процентов на замороженный счёт"""
-        mock_logger = MockLogger()
-        account = SavingsAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
-            monthly_interest_rate=0.05,
-            balance=10000,
+        account.withdraw(1000)
+        self.assertEqual(account.balance, 4000)
+
+    def test_withdraw_respecting_min_balance(self):
+        """Тест снятия с учетом минимального остатка"""
+        account, _ = make_account(
+            SavingsAccount,
+            monthly_interest_rate=0.03,
+            balance=5000,
             min_balance=1000,
-            status=AccountStatus.FROZEN,
-            logger=mock_logger,
+            logger=self.logger,
         )
 
-        with self.assertRaises(AccountFrozenError):
-            account.apply_monthly_interest()
+        account.withdraw(4000)
+        self.assertEqual(account.balance, 1000)
 
     def test_negative_min_balance_init(self):
         """Тест создания счёта с отрицательным минимальным остатком"""
-        mock_logger = MockLogger()
-
         with self.assertRaises(InsufficientFundsError):
-            SavingsAccount(
-                first_last_name="Test User",
-                account_type=AccountType.INDIVIDUAL,
-                currency=Currency.RUB,
+            make_account(
+                SavingsAccount,
                 monthly_interest_rate=0.03,
                 balance=5000,
                 min_balance=-1000,
-                logger=mock_logger,
+                logger=self.logger,
             )
 
     def test_get_account_info_savings(self):
         """Тест получения информации о сберегательном счёте"""
-        mock_logger = MockLogger()
-        account = SavingsAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.RUB,
+        account, _ = make_account(
+            SavingsAccount,
             monthly_interest_rate=0.05,
             balance=10000,
             min_balance=1000,
-            logger=mock_logger,
+            logger=self.logger,
         )
 
         info = account.get_account_info()
 
-        self.assertEqual(info["account_subtype"], "Savings")
-        self.assertEqual(info["min_balance"], 1000)
-        self.assertIn("monthly_interest_rate", info)
+        expected = {
+            "account_subtype": "Savings",
+            "min_balance": 1000,
+            "monthly_interest_rate": "5.0%",
+        }
+        self.assertEqual({key: info[key] for key in expected}, expected)
+
+        account.monthly_interest_rate = 0.02
+        self.assertEqual(account.get_account_info()["monthly_interest_rate"], "2.0%")
 
 
 # ============ Тесты для PremiumAccount ============
 class TestPremiumAccount(unittest.TestCase):
     """Тесты для класса PremiumAccount"""
 
-    def test_withdraw_with_overdraft(self):
-        """Тест снятия с использованием овердрафта"""
-        mock_logger = MockLogger()
-        account = PremiumAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.USD,
-            balance=1000,
-            overdraft_limit=5000,
-            fixed_fee=50,
-            logger=mock_logger,
-        )
-
-        account.withdraw(3000)
-        expected_balance = 1000 - 3000 - 50  # balance - withdrawal - fee
-        self.assertEqual(account.balance, expected_balance)
-
     def test_withdraw_exceeding_overdraft_limit(self):
         """Тест снятия, превышающего лимит овердрафта"""
-        mock_logger = MockLogger()
-        account = PremiumAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
+        account, mock_logger = make_account(
+            PremiumAccount,
             currency=Currency.USD,
             balance=1000,
             overdraft_limit=5000,
             fixed_fee=50,
-            logger=mock_logger,
         )
 
         with self.assertRaises(InsufficientFundsError):
             account.withdraw(7000)
 
-    def test_fee_charged_once_in_overdraft(self):
-        """Тест начисления комиссии только один раз при овердрафте"""
-        mock_logger = MockLogger()
-        account = PremiumAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
+    def test_overdraft_limit_change(self):
+        """Тест: изменение лимита овердрафта сразу учитывается при снятии"""
+        account, mock_logger = make_account(
+            PremiumAccount,
             currency=Currency.USD,
             balance=1000,
             overdraft_limit=5000,
             fixed_fee=50,
-            logger=mock_logger,
         )
 
-        account.withdraw(1500)  # Первый овердрафт
-        balance_after_first = account.balance
-
-        account.withdraw(500)  # Второй овердрафт
-        balance_after_second = account.balance
+        account.overdraft_limit = 500
+        self.assertEqual(account.get_account_info()["available_balance"], 1500)
+        with self.assertRaises(InsufficientFundsError):
+            account.withdraw(2000)
 
-        # Комиссия должна быть списана только один раз
-        self.assertEqual(balance_after_second, balance_after_first - 500)
+        account.overdraft_limit = 8000
+        account.withdraw(7000)
+        self.assertEqual(account.balance, 1000 - 7000 - 50)
 
-    def test_fee_reset_after_positive_balance(self):
-        """Тест сброса флага комиссии после выхода из овердрафта"""
-        mock_logger = MockLogger()
-        account = PremiumAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
+    def test_overdraft_state_machine(self):
+        """Тест цикла овердрафта: уход в минус, повторное снятие, возврат, новый уход"""
+        account, mock_logger = make_account(
+            PremiumAccount,
             currency=Currency.USD,
             balance=1000,
             overdraft_limit=5000,
             fixed_fee=50,
-            logger=mock_logger,
         )
 
-        account.withdraw(1500)  # Овердрафт с комиссией
-        account.deposit(2000)  # Возврат к положительному балансу
-
-        self.assertFalse(account.fee_charged)
-
-    def test_deposit_in_overdraft(self):
-        """Тест пополнения счёта в овердрафте"""
-        mock_logger = MockLogger()
-        account = PremiumAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.USD,
-            balance=1000,
-            overdraft_limit=5000,
-            fixed_fee=50,
-            logger=mock_logger,
-        )
+        account.withdraw(1500)  # Первый уход в овердрафт: списывается комиссия
+        self.assertEqual(account.balance, 1000 - 1500 - 50)
+        self.assertTrue(account.fee_charged)
+        self.assertEqual(len(mock_logger.events), 1)
+        self.assertIn("комиссия", mock_logger.events[0])
 
-        account.withdraw(2000)  # Баланс: -1050
-        account.deposit(3000)  # Баланс: 1950
+        account.withdraw(500)  # Глубже в овердрафт: комиссии нет
+        self.assertEqual(account.balance, -550 - 500)
+        self.assertEqual(len(mock_logger.events), 1)
 
+        account.deposit(3000)  # Возврат к положительному балансу сбрасывает флаг
         self.assertEqual(account.balance, 1950)
         self.assertFalse(account.fee_charged)
 
+        account.withdraw(3000)  # Новый уход в минус: комиссия снова
+        self.assertEqual(account.balance, 1950 - 3000 - 50)
+        self.assertEqual(len(mock_logger.events), 2)
+
     def test_get_account_info_premium(self):
         """Тест получения информации о премиум счёте"""
-        mock_logger = MockLogger()
-        account = PremiumAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
+        account, mock_logger = make_account(
+            PremiumAccount,
             currency=Currency.USD,
             balance=1000,
             overdraft_limit=5000,
             fixed_fee=50,
-            logger=mock_logger,
         )
 
         info = account.get_account_info()
 
-        self.assertEqual(info["account_subtype"], "Premium")
-        self.assertEqual(info["overdraft_limit"], 5000)
-        self.assertEqual(info["available_balance"], 6000)
+        expected = {
+            "account_subtype": "Premium",
+            "overdraft_limit": 5000,
+            "available_balance": 6000,
+        }
+        self.assertEqual({key: info[key] for key in expected}, expected)
+
+    def test_has_overdraft_flag(self):
+        """Тест флага овердрафта у типов счетов"""
+        self.assertTrue(PremiumAccount.has_overdraft)
+        self.assertFalse(BankAccount.has_overdraft)
+        self.assertFalse(SavingsAccount.has_overdraft)
+        self.assertFalse(InvestmentAccount.has_overdraft)
 
 
 # ============ Тесты для InvestmentAccount ============
@@ -546,315 +833,568 @@ class TestInvestmentAccount(unittest.TestCase):
 
     def test_add_asset_success(self):
         """Тест успешного добавления актива"""
-        mock_logger = MockLogger()
-        account = InvestmentAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
+        account, mock_logger = make_account(
+            InvestmentAccount,
             currency=Currency.USD,
             balance=10000,
             expected_annual_return=0.10,
-            logger=mock_logger,
         )
 
-        stock = Stock("AAPL", 10, 150)
-        account.add_asset(stock)
+        account.add_asset(AAPL_LOT)
 
         self.assertEqual(len(account.portfolio), 1)
         self.assertEqual(account.balance, 10000 - 1500)
 
     def test_add_asset_insufficient_funds(self):
         """Тест добавления актива при недостаточных средствах"""
-        mock_logger = MockLogger()
-        account = InvestmentAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
+        account, mock_logger = make_account(
+            InvestmentAccount,
             currency=Currency.USD,
             balance=1000,
             expected_annual_return=0.10,
-            logger=mock_logger,
         )
 
+        with self.assertRaises(InsufficientFundsError):
+            account.add_asset(AAPL_LOT)
+
+    def test_add_assets(self):
+        """Тест пакетной покупки активов"""
+        account, mock_logger = make_account(
+            InvestmentAccount,
+            currency=Currency.USD,
+            balance=10000,
+        )
+
+        account.add_assets([AAPL_LOT, Bond("US10Y", 2, 1000)])
+
+        self.assertEqual(len(account.portfolio), 2)
+        self.assertEqual(account.balance, 10000 - 1500 - 2000)
+        self.assertEqual(account.get_portfolio_value(), 3500)
+        self.assertEqual(len(mock_logger.events), 1)
+
+        with self.assertRaises(InsufficientFundsError):
+            account.add_assets([ETF("SPY", 10, 400), ETF("QQQ", 10, 400)])
+        self.assertEqual(len(account.portfolio), 2)
+        self.assertEqual(account.balance, 6500)
+
+    def test_asset_value_follows_setters(self):
+        """Тест: стоимость актива пересчитывается при смене цены и количества"""
         stock = Stock("AAPL", 10, 150)
+        self.assertEqual(stock.get_value(), 1500)
+
+        stock.price = 200
+        self.assertEqual(stock.get_value(), 2000)
+        stock.quantity = 5
+        self.assertEqual(stock.get_value(), 1000)
+        self.assertEqual(str(stock), "AAPL: 5 шт. @ 200")
+
+    def test_portfolio_value_follows_asset_setters(self):
+        """Тест: смена цены и количества актива сразу видна в стоимости портфеля"""
+        first, _ = make_account(InvestmentAccount, currency=Currency.USD, balance=5000)
+        second, _ = make_account(InvestmentAccount, currency=Currency.USD, balance=5000)
+        stock = Stock("AAPL", 10, 100)
+        first.add_asset(stock)
+        second.add_assets([stock])
+        self.assertEqual(first.get_portfolio_value(), 1000)
+
+        stock.price = 200
+        self.assertEqual(first.get_portfolio_value(), 2000)
+        self.assertEqual(second.get_portfolio_value(), 2000)
+
+        stock.quantity = 5
+        self.assertEqual(first.get_portfolio_value(), 1000)
+        self.assertEqual(second.get_total_value(), 4000 + 1000)
+
+    def test_portfolio_read_only(self):
+        """Тест: портфель нельзя изменить в обход add_asset"""
+        account, _ = make_account(InvestmentAccount, balance=5000, logger=NullLogger())
+        account.add_asset(Stock("A", 1, 100))
+
+        with self.assertRaises(TypeError):
+            account.portfolio[0] = Stock("B", 1, 500)
+        with self.assertRaises(AttributeError):
+            account.portfolio = []
+        self.assertEqual(account.get_portfolio_value(), 100)
+
+        account.add_asset(Stock("B", 1, 500))
+        self.assertEqual(account.get_portfolio_value(), 600)
+        self.assertEqual([asset.symbol for asset in account.portfolio], ["A", "B"])
+
+    def test_shared_asset_keeps_no_account_references(self):
+        """Тест: общий актив не удерживает счета и не тянет их в pickle"""
+        first, _ = make_account(InvestmentAccount, first_last_name="First Owner", balance=5000)
+        second, _ = make_account(InvestmentAccount, first_last_name="Second Owner", balance=5000)
+        stock = Stock("AAPL", 10, 100)
+        first.add_asset(stock)
+        second.add_asset(stock)
+        second.get_portfolio_value()
+
+        self.assertFalse(
+            any(isinstance(obj, InvestmentAccount) for obj in gc.get_referents(stock))
+        )
+        data = pickle.dumps(first)
+        self.assertNotIn("Second Owner".encode(), data)
+
+        restored = pickle.loads(data)
+        self.assertEqual(restored.get_portfolio_value(), 1000)
+        restored.portfolio[0].price = 300
+        self.assertEqual(restored.get_portfolio_value(), 3000)
+        self.assertEqual(first.get_portfolio_value(), 1000)
+
+    def test_project_yearly_growth(self):
+        """Тест прогноза годового роста"""
+        account, mock_logger = make_account(
+            InvestmentAccount,
+            currency=Currency.USD,
+            balance=10000,
+            expected_annual_return=0.10,
+        )
+
+        projection = account.project_yearly_growth(years=3)
+
+        self.assertIn("current_value", projection)
+        self.assertIn("projections", projection)
+        self.assertEqual(len(projection["projections"]), 3)
+
+        # Сложный процент по годам: сравнение с точностью до копейки
+        for year in range(1, 4):
+            with self.subTest(year=year):
+                self.assertAlmostEqual(
+                    projection["projections"][f"year_{year}"], 10000 * 1.10**year, places=2
+                )
+
+    def test_withdraw_only_free_cash(self):
+        """Тест снятия только из свободных средств"""
+        account, mock_logger = make_account(
+            InvestmentAccount,
+            currency=Currency.USD,
+            balance=10000,
+            expected_annual_return=0.10,
+        )
+
+        account.add_asset(AAPL_LOT)
 
         with self.assertRaises(InsufficientFundsError):
-            account.add_asset(stock)
+            account.withdraw(9000)
 
-    def test_get_portfolio_value(self):
-        """Тест расчёта стоимости портфеля"""
-        mock_logger = MockLogger()
-        account = InvestmentAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
+    def test_withdraw_free_cash_available(self):
+        """Тест снятия доступных свободных средств"""
+        account, mock_logger = make_account(
+            InvestmentAccount,
             currency=Currency.USD,
-            balance=50000,
+            balance=10000,
             expected_annual_return=0.10,
-            logger=mock_logger,
         )
 
-        account.add_asset(Stock("AAPL", 10, 150))  # 1500
-        account.add_asset(Bond("US10Y", 5, 1000))  # 5000
-        account.add_asset(ETF("SPY", 20, 400))  # 8000
+        account.add_asset(AAPL_LOT)
+        account.withdraw(5000)
+
+        expected_balance = 10000 - 1500 - 5000
+        self.assertEqual(account.balance, expected_balance)
+
 
-        expected_portfolio_value = 1500 + 5000 + 8000
-        self.assertEqual(account.get_portfolio_value(), expected_portfolio_value)
+class TestBlockedAccounts(unittest.TestCase):
+    """Тесты заблокированных счетов: отказ до изменений, поэтому счета общие на класс"""
 
-    def test_get_total_value(self):
-        """Тест расчёта общей стоимости счёта"""
-        mock_logger = MockLogger()
-        account = InvestmentAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
+    @classmethod
+    def setUpClass(cls):
+        cls.accounts = {
+            status: make_account(BankAccount, balance=1000, status=status)
+            for status in (AccountStatus.FROZEN, AccountStatus.CLOSED)
+        }
+        cls.savings, cls.savings_logger = make_account(
+            SavingsAccount,
+            monthly_interest_rate=0.05,
+            balance=10000,
+            min_balance=1000,
+            status=AccountStatus.FROZEN,
+        )
+        cls.investment, cls.investment_logger = make_account(
+            InvestmentAccount,
+            currency=Currency.USD,
+            balance=10000,
+            expected_annual_return=0.10,
+            status=AccountStatus.FROZEN,
+        )
+
+    def test_blocked_status_operations(self):
+        """Тест: замороженный и закрытый счёт отклоняют операции без логирования"""
+        cases = [
+            (AccountStatus.FROZEN, AccountFrozenError),
+            (AccountStatus.CLOSED, AccountClosedError),
+        ]
+        for status, error in cases:
+            account, mock_logger = self.accounts[status]
+            for operation in ("deposit", "withdraw"):
+                with self.subTest(status=status, operation=operation):
+                    with self.assertRaises(error):
+                        getattr(account, operation)(100)
+
+                    self.assertEqual(account.balance, 1000)
+                    self.assertEqual(len(mock_logger.deposits), 0)
+                    self.assertEqual(len(mock_logger.withdrawals), 0)
+
+    def test_interest_on_frozen_account(self):
+        """Тест начисления процентов на замороженный счёт"""
+        with self.assertRaises(AccountFrozenError):
+            self.savings.apply_monthly_interest()
+
+        self.assertEqual(self.savings.balance, 10000)
+        self.assertEqual(len(self.savings_logger.events), 0)
+
+    def test_add_asset_frozen_account(self):
+        """Тест добавления актива на замороженный счёт"""
+        with self.assertRaises(AccountFrozenError):
+            self.investment.add_asset(AAPL_LOT)
+
+        self.assertEqual(self.investment.portfolio, ())
+        self.assertEqual(self.investment.balance, 10000)
+
+
+class TestInvestmentPortfolioReadOnly(unittest.TestCase):
+    """Тесты только на чтение: один собранный портфель на весь класс"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.account, cls.mock_logger = make_account(
+            InvestmentAccount,
             currency=Currency.USD,
             balance=50000,
             expected_annual_return=0.10,
-            logger=mock_logger,
         )
+        cls.account.add_asset(AAPL_LOT)  # 1500
+        cls.account.add_asset(Bond("US10Y", 5, 1000))  # 5000
+        cls.account.add_asset(ETF("SPY", 20, 400))  # 8000
 
-        account.add_asset(Stock("AAPL", 10, 150))
+    def test_portfolio_math(self):
+        """Тест стоимости портфеля, общей стоимости и свободных средств"""
+        cases = [
+            ("get_portfolio_value", 1500 + 5000 + 8000),
+            ("get_total_value", (50000 - 14500) + 14500),
+        ]
+        for getter, expected in cases:
+            with self.subTest(getter=getter):
+                self.assertEqual(getattr(self.account, getter)(), expected)
+        self.assertEqual(self.account.balance, 50000 - 14500)
 
-        expected_total = (50000 - 1500) + 1500
-        self.assertEqual(account.get_total_value(), expected_total)
+    def test_get_account_info_investment(self):
+        """Тест получения информации об инвестиционном счёте"""
+        info = self.account.get_account_info()
 
-    def test_project_yearly_growth(self):
-        """Тест прогноза годового роста"""
-        mock_logger = MockLogger()
-        account = InvestmentAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.USD,
-            balance=10000,
-            expected_annual_return=0.10,
-            logger=mock_logger,
-        )
+        expected = {
+            "account_subtype": "Investment",
+            "portfolio_value": 14500,
+            "total_value": 50000,
+            "assets_count": 3,
+        }
+        self.assertEqual({key: info[key] for key in expected}, expected)
 
-        projection = account.project_yearly_growth(years=3)
 
-        self.assertIn("current_value", projection)
-        self.assertIn("projections", projection)
-        self.assertEqual(len(projection["projections"]), 3)
+class TestBank(SharedLoggerTestCase):
+    """Тесты для класса Bank"""
 
-        # Проверка расчёта для первого года
-        expected_year_1 = round(10000 * 1.10, 2)
-        self.assertEqual(projection["projections"]["year_1"], expected_year_1)
+    def test_bank_add_client_success(self):
+        """Тест успешного добавления клиента"""
+        client = Client(client_id="FL001", full_name="Иван Иванов", birth_date="1990-05-15")
 
-    def test_withdraw_only_free_cash(self):
-        """Тест снятия только из свободных средств"""
-        mock_logger = MockLogger()
-        account = InvestmentAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.USD,
-            balance=10000,
-            expected_annual_return=0.10,
-            logger=mock_logger,
-        )
+        bank = make_bank()
+        bank.add_client(client)
 
-        account.add_asset(Stock("AAPL", 10, 150))
+        self.assertIn("FL001", bank.clients)
+        self.assertEqual(bank.clients["FL001"].full_name, "Иван Иванов")
 
-        with self.assertRaises(InsufficientFundsError):
-            account.withdraw(9000)
+    def test_bank_add_client_duplicate(self):
+        """Тест добавления дублирующегося клиента"""
+        client = Client("FL001", "Иван Иванов", "1990-05-15")
 
-    def test_withdraw_free_cash_available(self):
-        """Тест снятия доступных свободных средств"""
-        mock_logger = MockLogger()
-        account = InvestmentAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.USD,
-            balance=10000,
-            expected_annual_return=0.10,
-            logger=mock_logger,
-        )
+        bank = make_bank()
+        bank.add_client(client)
 
-        account.add_asset(Stock("AAPL", 10, 150))
-        account.withdraw(5000)
+        with self.assertRaises(InvalidOperationError):
+            bank.add_client(client)  # Должен упасть
 
-        expected_balance = 10000 - 1500 - 5000
-        self.assertEqual(account.balance, expected_balance)
+    def test_bank_client_age_validation(self):
+        """Тест валидации возраста клиента"""
+        with self.assertRaises(InvalidOperationError):
+            Client("UL999", "Младенец", "2025-01-01")  # <18 лет
 
-    def test_add_asset_frozen_account(self):
-        """Тест добавления актива на замороженный счёт"""
-        mock_logger = MockLogger()
-        account = InvestmentAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.USD,
+    def test_client_birth_date_formats(self):
+        """Тест: дата рождения принимается и без ведущих нулей"""
+        client = Client("FL001", "Иван Иванов", "1990-1-5")
+        self.assertEqual(client.birth_date, "1990-1-5")
+
+        for raw in ("1990/01/05", "05-01-1990", "1990-13-01"):
+            with self.subTest(raw=raw):
+                with self.assertRaises(ValueError):
+                    Client("FL002", "Мария Петрова", raw)
+
+    def test_bank_open_account_success(self):
+        """Тест открытия счёта с успешной аутентификацией"""
+        client = Client("FL001", "Иван Иванов", "1990-05-15")
+        bank = make_bank()
+        bank.add_client(client)
+
+        acc_uuid = bank.open_account(
+            client_id="FL001",
+            account_type=BankAccount,
+            currency=Currency.RUB,
             balance=10000,
-            expected_annual_return=0.10,
-            status=AccountStatus.FROZEN,
-            logger=mock_logger,
         )
 
-        stock = Stock("AAPL", 10, 150)
+        self.assertIn(acc_uuid, bank.accounts)
+        self.assertEqual(bank.accounts[acc_uuid].balance, 10000)
+        self.assertIn(acc_uuid, client.accounts)
 
-        with self.assertRaises(AccountFrozenError):
-            account.add_asset(stock)
+    def test_open_account_interns_uuid_once(self):
+        """Тест: банк и клиент хранят один интернированный объект UUID"""
+        client = Client("FL001", "Иван Иванов", "1990-05-15")
+        bank = make_bank()
+        bank.add_client(client)
+        raw_uuid = "".join(["acc-", "0001"])
 
-    def test_get_account_info_investment(self):
-        """Тест получения информации об инвестиционном счёте"""
-        mock_logger = MockLogger()
-        account = InvestmentAccount(
-            first_last_name="Test User",
-            account_type=AccountType.INDIVIDUAL,
-            currency=Currency.USD,
-            balance=50000,
-            expected_annual_return=0.12,
-            logger=mock_logger,
+        acc_uuid = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, account_uuid=raw_uuid, logger=self.logger
         )
 
-        account.add_asset(Stock("AAPL", 10, 150))
+        self.assertIs(acc_uuid, sys.intern("acc-0001"))
+        self.assertIs(client.accounts[0], acc_uuid)
+        self.assertIs(next(iter(bank.accounts)), acc_uuid)
 
-        info = account.get_account_info()
+    def test_bank_open_account_auth_fail(self):
+        """Тест отказа в открытии счёта неизвестному клиенту, включая повторные попытки"""
+        client = Client("FL001", "Иван Иванов", "1990-05-15")
+        bank = make_bank()
+        bank.add_client(client)
+
+        # Каждая попытка, в том числе после трёх неудачных, отклоняется
+        for attempt in range(1, 5):
+            with self.subTest(attempt=attempt):
+                with self.assertRaises(AccountClosedError):
+                    bank.open_account("fake_id", BankAccount, Currency.RUB)
+        self.assertEqual(bank.accounts, {})
+
+    def test_bank_freeze_unfreeze_account(self):
+        """Тест заморозки/разморозки счёта"""
+        client = Client("FL001", "Иван Иванов", "1990-05-15")
+        bank = make_bank()
+        bank.add_client(client)
+
+        acc_uuid = bank.open_account("FL001", BankAccount, Currency.RUB, balance=10000)
+        account = bank.accounts[acc_uuid]
 
-        self.assertEqual(info["account_subtype"], "Investment")
-        self.assertIn("portfolio_value", info)
-        self.assertIn("total_value", info)
-        self.assertEqual(info["assets_count"], 1)
+        # Заморозка
+        bank.freeze_account(acc_uuid, "admin")
+        self.assertEqual(account.status, AccountStatus.FROZEN)
 
+        # Разморозка
+        bank.unfreeze_account(acc_uuid, "admin")
+        self.assertEqual(account.status, AccountStatus.ACTIVE)
 
-def test_bank_add_client_success(self):
-    """Тест успешного добавления клиента"""
-    client = Client(client_id="FL001", full_name="Иван Иванов", birth_date="1990-05-15")
+    def test_bank_search_accounts(self):
+        """Тест поиска счетов клиента"""
+        client = Client("FL001", "Иван Иванов", "1990-05-15")
+        bank = make_bank()
+        bank.add_client(client)
 
-    bank = Bank()
-    bank.add_client(client)
+        acc1 = bank.open_account(
+            "FL001", SavingsAccount, Currency.RUB, balance=5000, monthly_interest_rate=0.01
+        )
+        acc2 = bank.open_account(
+            "FL001", PremiumAccount, Currency.USD, balance=10000, overdraft_limit=2000
+        )
 
-    self.assertIn("FL001", bank.clients)
-    self.assertEqual(bank.clients["FL001"].full_name, "Иван Иванов")
+        accounts_info = bank.search_accounts("FL001")
 
+        self.assertEqual(len(accounts_info), 2)
+        self.assertEqual(accounts_info[0]["balance"], 5000)
+        self.assertEqual(accounts_info[1]["balance"], 10000)
 
-def test_bank_add_client_duplicate(self):
-    """Тест добавления дублирующегося клиента"""
-    client = Client("FL001", "Иван Иванов", "1990-05-15")
+    def test_bank_total_balance(self):
+        """Тест подсчёта общего баланса банка"""
+        client1 = Client("FL001", "Иван Иванов", "1990-05-15")
+        client2 = Client("UL002", "ООО Альфа", "1995-01-01")
 
-    bank = Bank()
-    bank.add_client(client)
+        bank = make_bank()
+        bank.add_client(client1)
+        bank.add_client(client2)
 
-    with self.assertRaises(InvalidOperationError):
-        bank.add_client(client)  # Должен упасть
+        bank.open_account("FL001", BankAccount, Currency.RUB, balance=10000)
+        bank.open_account("UL002", BankAccount, Currency.RUB, balance=5000)
 
+        self.assertEqual(bank.get_total_balance(), 15000)  # Только ACTIVE
 
-def test_bank_client_age_validation(self):
-    """Тест валидации возраста клиента"""
-    with self.assertRaises(InvalidOperationError):
-        Client("UL999", "Младенец", "2025-01-01")  # <18 лет
+    def test_bank_clients_ranking(self):
+        """Тест ранжирования клиентов по балансу"""
+        client1 = Client("FL001", "Иван Иванов", "1990-05-15")
+        client2 = Client("UL002", "ООО Альфа", "1995-01-01")
 
+        bank = make_bank()
+        bank.add_client(client1)
+        bank.add_client(client2)
 
-def test_bank_open_account_success(self):
-    """Тест открытия счёта с успешной аутентификацией"""
-    client = Client("FL001", "Иван Иванов", "1990-05-15")
-    bank = Bank()
-    bank.add_client(client)
+        bank.open_account("FL001", BankAccount, Currency.RUB, balance=20000)
+        bank.open_account("UL002", BankAccount, Currency.RUB, balance=10000)
 
-    acc_uuid = bank.open_account(
-        client_id="FL001",
-        account_type=BankAccount,
-        currency=Currency.RUB,
-        balance=10000,
-    )
+        ranking = bank.get_clients_ranking(2)
 
-    self.assertIn(acc_uuid, bank.accounts)
-    self.assertEqual(bank.accounts[acc_uuid].balance, 10000)
-    self.assertIn(acc_uuid, client.accounts)
+        self.assertEqual(ranking[0]["client"], "Иван Иванов")
+        self.assertEqual(ranking[0]["total"], 20000)
+        self.assertEqual(ranking[1]["client"], "ООО Альфа")
+        self.assertEqual(ranking[1]["total"], 10000)
 
+    def test_open_account_type_from_client_id(self):
+        """Тест: тип счёта определяется по префиксу ID клиента"""
+        bank = make_bank()
+        bank.add_client(Client("UL001", "ООО Альфа", "1990-05-15"))
 
-def test_bank_open_account_auth_fail(self):
-    """Тест отказа в открытии счёта из-за аутентификации"""
-    client = Client("FL001", "Иван Иванов", "1990-05-15")
-    bank = Bank()
-    bank.add_client(client)
+        acc_uuid = bank.open_account(
+            "UL001", BankAccount, Currency.RUB, logger=self.logger
+        )
 
-    with self.assertRaises(AccountClosedError):
-        bank.open_account("fake_id", BankAccount, Currency.RUB)
+        self.assertEqual(bank.accounts[acc_uuid].account_type, AccountType.LEGAL)
+        self.assertEqual(bank.search_accounts("UL001")[0]["type"], "UL")
 
+    def test_bulk_deposit(self):
+        """Тест пакетного пополнения нескольких счетов"""
+        bank = make_bank()
+        bank.add_client(Client("FL001", "Иван Иванов", "1990-05-15"))
 
-def test_bank_three_failed_attempts(self):
-    """Тест блокировки после 3 неудачных попыток"""
-    bank = Bank()
+        acc1 = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=1000, logger=self.logger
+        )
+        acc2 = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=500, logger=self.logger
+        )
 
-    # 3 неудачные попытки
-    for _ in range(3):
-        try:
-            bank.open_account("fake_id", BankAccount, Currency.RUB)
-        except AccountClosedError:
-            pass
+        bank.bulk_deposit([(acc1, 100), (acc2, 50), (acc1, 200)])
 
-    # 4-я попытка должна быть заблокирована
-    with self.assertRaises(AccountClosedError):
-        bank.open_account("fake_id", BankAccount, Currency.RUB)
+        self.assertEqual(bank.accounts[acc1].balance, 1300)
+        self.assertEqual(bank.accounts[acc2].balance, 550)
+        self.assertEqual(len(self.logger.deposits), 3)
 
+    def test_bulk_deposit_frozen_account(self):
+        """Тест: замороженный счёт в пакете отменяет весь пакет"""
+        bank = make_bank()
+        bank.add_client(Client("FL001", "Иван Иванов", "1990-05-15"))
 
-def test_bank_freeze_unfreeze_account(self):
-    """Тест заморозки/разморозки счёта"""
-    client = Client("FL001", "Иван Иванов", "1990-05-15")
-    bank = Bank()
-    bank.add_client(client)
+        acc1 = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=1000, logger=self.logger
+        )
+        acc2 = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=500, logger=self.logger
+        )
+        bank.freeze_account(acc2, "admin")
 
-    acc_uuid = bank.open_account("FL001", BankAccount, Currency.RUB, balance=10000)
-    account = bank.accounts[acc_uuid]
+        with self.assertRaises(AccountFrozenError):
+            bank.bulk_deposit([(acc1, 100), (acc2, 50)])
 
-    # Заморозка
-    bank.freeze_account(acc_uuid, "admin")
-    self.assertEqual(account.status, AccountStatus.FROZEN)
+        self.assertEqual(bank.accounts[acc1].balance, 1000)
+        self.assertEqual(len(self.logger.deposits), 0)
 
-    # Разморозка
-    bank.unfreeze_account(acc_uuid, "admin")
-    self.assertEqual(account.status, AccountStatus.ACTIVE)
+    def test_apply_monthly_interest_batch(self):
+        """Тест пакетного начисления процентов только активным сберегательным счетам"""
+        bank = make_bank()
+        bank.add_client(Client("FL001", "Иван Иванов", "1990-05-15"))
 
+        active = bank.open_account(
+            "FL001",
+            SavingsAccount,
+            Currency.RUB,
+            monthly_interest_rate=0.01,
+            balance=10000,
+            logger=self.logger,
+        )
+        frozen = bank.open_account(
+            "FL001",
+            SavingsAccount,
+            Currency.RUB,
+            monthly_interest_rate=0.01,
+            balance=10000,
+            logger=self.logger,
+        )
+        regular = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=10000, logger=self.logger
+        )
+        bank.freeze_account(frozen, "admin")
 
-def test_bank_search_accounts(self):
-    """Тест поиска счетов клиента"""
-    client = Client("FL001", "Иван Иванов", "1990-05-15")
-    bank = Bank()
-    bank.add_client(client)
+        self.assertEqual(bank.apply_monthly_interest_batch(), 1)
+        self.assertAlmostEqual(bank.accounts[active].balance, 10100)
+        self.assertEqual(bank.accounts[frozen].balance, 10000)
+        self.assertEqual(bank.accounts[regular].balance, 10000)
 
-    acc1 = bank.open_account(
-        "FL001", SavingsAccount, Currency.RUB, balance=5000, monthly_interest_rate=0.01
-    )
-    acc2 = bank.open_account(
-        "FL001", PremiumAccount, Currency.USD, balance=10000, overdraft_limit=2000
-    )
+    def test_client_age_counts_month_and_day(self):
+        """Тест: возраст клиента учитывает месяц и день рождения"""
 
-    accounts_info = bank.search_accounts("FL001")
+        class FixedDate(date):
+            @classmethod
+            def today(cls):
+                return cls(2024, 6, 15)
 
-    self.assertEqual(len(accounts_info), 2)
-    self.assertEqual(accounts_info[0]["balance"], 5000)
-    self.assertEqual(accounts_info[1]["balance"], 10000)
+        with patch("main.date", FixedDate):
+            Client("FL001", "Иван Иванов", "2006-06-15")  # ровно 18 лет
 
+            with self.assertRaises(InvalidOperationError):
+                Client("FL002", "Пётр Петров", "2006-06-16")  # 18 исполнится завтра
 
-def test_bank_total_balance(self):
-    """Тест подсчёта общего баланса банка"""
-    client1 = Client("FL001", "Иван Иванов", "1990-05-15")
-    client2 = Client("UL002", "ООО Альфа", "2010-01-01")
+        with self.assertRaises(ValueError):
+            Client("FL003", "Анна Смирнова", "15.05.1990")
 
-    bank = Bank()
-    bank.add_client(client1)
-    bank.add_client(client2)
+    def test_clients_ranking(self):
+        """Тест рейтинга клиентов по сумме балансов"""
+        bank = make_bank()
+        rich = Client("FL001", "Иван Иванов", "1990-05-15")
+        poor = Client("FL002", "Пётр Петров", "1985-03-10")
+        bank.add_client(rich)
+        bank.add_client(poor)
 
-    bank.open_account("FL001", BankAccount, Currency.RUB, balance=10000)
-    bank.open_account("UL002", BankAccount, Currency.RUB, balance=5000)
+        bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=5000, logger=self.logger
+        )
+        bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=3000, logger=self.logger
+        )
+        bank.open_account(
+            "FL002", BankAccount, Currency.RUB, balance=1000, logger=self.logger
+        )
 
-    self.assertEqual(bank.get_total_balance(), 15000)  # Только ACTIVE
+        # Счёт, привязанный только по UUID, тоже учитывается
+        extra = BankAccount(
+            "Пётр Петров", AccountType.INDIVIDUAL, Currency.RUB, 9000, logger=self.logger
+        )
+        bank.accounts[extra.account_uuid] = extra
+        poor.add_account(extra.account_uuid)
 
+        ranking = bank.get_clients_ranking()
 
-def test_bank_clients_ranking(self):
-    """Тест ранжирования клиентов по балансу"""
-    client1 = Client("FL001", "Иван Иванов", "1990-05-15")
-    client2 = Client("UL002", "ООО Альфа", "2015-01-01")
+        self.assertEqual(
+            ranking,
+            [
+                {"client": "Пётр Петров", "total": 10000},
+                {"client": "Иван Иванов", "total": 8000},
+            ],
+        )
 
-    bank = Bank()
-    bank.add_client(client1)
-    bank.add_client(client2)
+    def test_auth_hour_cached_until_refresh(self):
+        """Тест: час для проверки ночного запрета берётся из кэша до истечения окна"""
+        bank = Bank()
+        bank.add_client(Client("FL001", "Иван Иванов", "1990-05-15"))
 
-    bank.open_account("FL001", BankAccount, Currency.RUB, balance=20000)
-    bank.open_account("UL002", BankAccount, Currency.RUB, balance=10000)
+        with patch("main.datetime") as mock_datetime, patch(
+            "main.time.monotonic"
+        ) as mock_monotonic:
+            mock_monotonic.return_value = 1000.0
+            mock_datetime.now.return_value = datetime(2024, 1, 1, 3, 0, 0)
+            with self.assertRaises(InvalidOperationError):
+                bank.authenticate_client("FL001", "1234")
 
-    ranking = bank.get_clients_ranking(2)
+            # Время изменилось, но окно кэша ещё не истекло
+            mock_datetime.now.return_value = datetime(2024, 1, 1, 12, 0, 0)
+            mock_monotonic.return_value = 1010.0
+            with self.assertRaises(InvalidOperationError):
+                bank.authenticate_client("FL001", "1234")
 
-    self.assertEqual(ranking[0]["client"], "Иван Иванов")
-    self.assertEqual(ranking[0]["total"], 20000)
-    self.assertEqual(ranking[1]["client"], "ООО Альфа")
-    self.assertEqual(ranking[1]["total"], 10000)
+            mock_monotonic.return_value = 1031.0
+            self.assertTrue(bank.authenticate_client("FL001", "1234"))
 
 
 class TestTransaction(unittest.TestCase):
@@ -964,6 +1504,34 @@ class TestTransaction(unittest.TestCase):
 
         self.assertTrue(tx_urgent < tx_low)
 
+    def test_priority_is_int(self):
+        """Тест: приоритеты сравниваются как целые числа"""
+        self.assertLess(TransactionPriority.URGENT, TransactionPriority.LOW)
+        self.assertEqual(TransactionPriority.HIGH, 1)
+
+    def test_ids_interned(self):
+        """Тест: ID транзакции и клиента интернируются"""
+        tx = Transaction("".join(["TX", "001"]), TransactionType.DEPOSIT, 100, Currency.RUB)
+        client = Client("".join(["FL", "001"]), "Иван Иванов", "1990-05-15")
+
+        self.assertIs(tx.transaction_id, sys.intern("TX001"))
+        self.assertIs(client.client_id, sys.intern("FL001"))
+
+    def test_non_string_id_kept(self):
+        """Тест: нестроковый ID транзакции сохраняется без интернирования"""
+        tx = Transaction(123, TransactionType.DEPOSIT, 100, Currency.RUB)
+        self.assertEqual(tx.transaction_id, 123)
+
+        queue = TransactionQueue(logger=MockLogger())
+        queue.add_transaction(tx)
+        self.assertTrue(queue.cancel_transaction(123))
+
+    def test_type_and_status_are_str(self):
+        """Тест: тип и статус транзакции совпадают со своими строковыми кодами"""
+        self.assertEqual(TransactionType.DEPOSIT, "deposit")
+        self.assertIs(TransactionStatus("pending"), TransactionStatus.PENDING)
+        self.assertEqual({TransactionType.TRANSFER: 1}["transfer"], 1)
+
 
 # ============ Тесты для TransactionQueue ============
 class TestTransactionQueue(unittest.TestCase):
@@ -997,6 +1565,40 @@ class TestTransactionQueue(unittest.TestCase):
 
         self.assertEqual(queue.get_pending_count(), 1)
 
+    def test_queue_events_go_to_logger(self):
+        """Тест: сообщения очереди передаются в логгер, а не в print"""
+        mock_logger = MockLogger()
+        queue = TransactionQueue(logger=mock_logger)
+        tx = Transaction("TX001", TransactionType.DEPOSIT, 1000, Currency.RUB)
+
+        queue.add_transaction(tx)
+
+        self.assertEqual(len(mock_logger.events), 1)
+        self.assertIn("TX001", mock_logger.events[0])
+
+    def test_scheduled_transactions_released_in_time_order(self):
+        """Тест выдачи отложенных транзакций по мере наступления времени"""
+        queue = TransactionQueue()
+        start_ns = 1_000 * 1_000_000_000
+        tx_late = Transaction("TX001", TransactionType.DEPOSIT, 100, Currency.RUB)
+        tx_early = Transaction("TX002", TransactionType.DEPOSIT, 200, Currency.RUB)
+
+        with patch("main.time.monotonic_ns") as mock_monotonic_ns:
+            mock_monotonic_ns.return_value = start_ns
+            queue.add_transaction(tx_late, delay_seconds=10)
+            queue.add_transaction(tx_early, delay_seconds=5)
+
+            self.assertIsNone(queue.get_next_transaction())
+
+            mock_monotonic_ns.return_value = start_ns + 6 * 1_000_000_000
+            self.assertIs(queue.get_next_transaction(), tx_early)
+            self.assertIsNone(queue.get_next_transaction())
+
+            mock_monotonic_ns.return_value = start_ns + 10 * 1_000_000_000
+            self.assertIs(queue.get_next_transaction(), tx_late)
+
+        self.assertEqual(queue.get_pending_count(), 0)
+
     def test_get_next_transaction_by_priority(self):
         """Тест получения транзакции по приоритету"""
         queue = TransactionQueue()
@@ -1025,6 +1627,21 @@ class TestTransactionQueue(unittest.TestCase):
         self.assertEqual(next_tx.transaction_id, "TX002")  # URGENT первым
         self.assertEqual(next_tx.status, TransactionStatus.PROCESSING)
 
+    def test_priority_changed_before_enqueue(self):
+        """Тест: очередь учитывает приоритет, изменённый после создания транзакции"""
+        queue = TransactionQueue(logger=MockLogger())
+        tx_first, tx_raised = (
+            Transaction(tx_id, TransactionType.DEPOSIT, 100, Currency.RUB)
+            for tx_id in ("TX001", "TX002")
+        )
+        tx_raised.priority = TransactionPriority.URGENT
+
+        self.assertTrue(tx_raised < tx_first)
+        queue.add_transaction(tx_first)
+        queue.add_transaction(tx_raised)
+
+        self.assertIs(queue.get_next_transaction(), tx_raised)
+
     def test_get_next_transaction_empty_queue(self):
         """Тест получения транзакции из пустой очереди"""
         queue = TransactionQueue()
@@ -1049,6 +1666,44 @@ class TestTransactionQueue(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(tx.status, TransactionStatus.CANCELLED)
 
+    def test_cancelled_transaction_skipped(self):
+        """Тест: отменённая транзакция не выдаётся из очереди и не считается ожидающей"""
+        queue = TransactionQueue(logger=MockLogger())
+        head, delayed, first, second = (
+            Transaction(tx_id, TransactionType.DEPOSIT, 100, Currency.RUB)
+            for tx_id in ("TX001", "TX002", "TX003", "TX004")
+        )
+        second.created_at = first.created_at  # одинаковые приоритет и время создания
+
+        queue.add_transaction(head)
+        queue.add_transaction(delayed, delay_seconds=60)
+        queue.add_transaction(first)
+        queue.add_transaction(second)
+        self.assertTrue(queue.cancel_transaction("TX001"))
+        self.assertTrue(queue.cancel_transaction("TX002"))
+        self.assertEqual(queue.get_pending_count(), 2)
+
+        self.assertIs(queue.get_next_transaction(), first)  # равные ключи — FIFO
+        self.assertIs(queue.get_next_transaction(), second)
+        self.assertIsNone(queue.get_next_transaction())
+        self.assertEqual(head.status, TransactionStatus.CANCELLED)
+        self.assertEqual(queue.get_pending_count(), 0)
+
+    def test_add_non_pending_transaction_rejected(self):
+        """Тест: в очередь нельзя добавить уже отменённую транзакцию"""
+        queue = TransactionQueue(logger=MockLogger())
+        tx = Transaction("TX001", TransactionType.DEPOSIT, 100, Currency.RUB)
+        tx.mark_cancelled()
+
+        for delay_seconds in (0, 5):
+            with self.subTest(delay_seconds=delay_seconds):
+                with self.assertRaises(InvalidOperationError):
+                    queue.add_transaction(tx, delay_seconds=delay_seconds)
+
+        self.assertEqual(queue.get_pending_count(), 0)
+        self.assertIsNone(queue.get_next_transaction())
+        self.assertIsNone(queue.get_transaction("TX001"))
+
     def test_cancel_transaction_not_found(self):
         """Тест отмены несуществующей транзакции"""
         queue = TransactionQueue()
@@ -1107,6 +1762,20 @@ class TestCurrencyConverter(unittest.TestCase):
 
         self.assertEqual(rate, 95.0)
 
+    def test_convert_many_matches_convert(self):
+        """Тест: пакетная конвертация совпадает с поштучной"""
+        amounts = [1, 95, 1000, 12.34]
+
+        converted = CurrencyConverter.convert_many(amounts, Currency.USD, Currency.EUR)
+
+        self.assertEqual(
+            converted,
+            [CurrencyConverter.convert(a, Currency.USD, Currency.EUR) for a in amounts],
+        )
+        self.assertEqual(
+            CurrencyConverter.convert_many(amounts, Currency.RUB, Currency.RUB), amounts
+        )
+
 
 # ============ Тесты для FeeCalculator ============
 class TestFeeCalculator(unittest.TestCase):
@@ -1124,8 +1793,7 @@ class TestFeeCalculator(unittest.TestCase):
             TransactionType.EXTERNAL_TRANSFER, 10000, Currency.RUB
         )
 
-        expected_fee = 10000 * 0.015
-        self.assertEqual(fee, expected_fee)
+        self.assertEqual(fee, 150.0)  # 1.5% от 10000
 
     def test_external_transfer_min_fee(self):
         """Тест минимальной комиссии для внешнего перевода"""
@@ -1141,23 +1809,58 @@ class TestFeeCalculator(unittest.TestCase):
             TransactionType.TRANSFER, 1000, Currency.RUB, currency_conversion=True
         )
 
-        expected_fee = 1000 * 0.01
-        self.assertEqual(fee, expected_fee)
+        self.assertEqual(fee, 10.0)  # 1% от 1000
+
+    def test_fee_exact_in_minor_units(self):
+        """Тест: половина копейки округляется до чётной, как у процентов по вкладу"""
+        external = FeeCalculator.calculate_fee(
+            TransactionType.EXTERNAL_TRANSFER, 5003, Currency.RUB
+        )
+        conversion = FeeCalculator.calculate_fee(
+            TransactionType.TRANSFER, 1000.5, Currency.RUB, currency_conversion=True
+        )
+
+        self.assertEqual(external, 75.04)  # 75.045
+        self.assertEqual(conversion, 10.0)  # 10.005
+
+    def test_calculate_fee_many_matches_scalar(self):
+        """Тест: пакетный расчёт совпадает с поштучным"""
+        types = [
+            TransactionType.TRANSFER,
+            TransactionType.EXTERNAL_TRANSFER,
+            TransactionType.EXTERNAL_TRANSFER,
+            TransactionType.DEPOSIT,
+        ]
+        amounts = [1000, 1000, 10000, 333.33]
+        conversions = [True, False, True, False]
+
+        fees = FeeCalculator.calculate_fee_many(types, amounts, conversions)
+
+        expected = [
+            FeeCalculator.calculate_fee(t, a, Currency.RUB, c)
+            for t, a, c in zip(types, amounts, conversions)
+        ]
+        self.assertEqual(fees, expected)
+        self.assertEqual(FeeCalculator.calculate_fee_many(types, amounts)[1], 50.0)
 
 
 # ============ Тесты для TransactionProcessor ============
-class TestTransactionProcessor(unittest.TestCase):
+class TestTransactionProcessor(SharedLoggerTestCase):
     """Тесты для класса TransactionProcessor"""
 
+    def setUp(self):
+        super().setUp()
+        # Клиент копит UUID своих счетов, поэтому банк и клиенты — свои на каждый тест
+        self.bank = make_bank()
+        self.bank.add_client(Client("FL001", "Иван Иванов", "1990-05-15"))
+        self.bank.add_client(Client("FL002", "Мария Петрова", "1985-03-20"))
+
     def test_process_deposit_success(self):
         """Тест успешной обработки пополнения"""
-        mock_logger = MockLogger()
-        bank = Bank()
-        client = Client("FL001", "Иван Иванов", "1990-05-15")
-        bank.add_client(client)
+        bank = self.bank
 
         acc_uuid = bank.open_account(
-            "FL001", BankAccount, Currency.RUB, balance=1000, logger=mock_logger
+            "FL001", BankAccount, Currency.RUB, balance=1000, logger=self.logger
         )
 
         processor = TransactionProcessor(bank)
@@ -1177,13 +1880,10 @@ class TestTransactionProcessor(unittest.TestCase):
 
     def test_process_withdrawal_success(self):
         """Тест успешной обработки снятия"""
-        mock_logger = MockLogger()
-        bank = Bank()
-        client = Client("FL001", "Иван Иванов", "1990-05-15")
-        bank.add_client(client)
+        bank = self.bank
 
         acc_uuid = bank.open_account(
-            "FL001", BankAccount, Currency.RUB, balance=1000, logger=mock_logger
+            "FL001", BankAccount, Currency.RUB, balance=1000, logger=self.logger
         )
 
         processor = TransactionProcessor(bank)
@@ -1203,13 +1903,10 @@ class TestTransactionProcessor(unittest.TestCase):
 
     def test_process_withdrawal_insufficient_funds(self):
         """Тест обработки снятия с недостаточным балансом"""
-        mock_logger = MockLogger()
-        bank = Bank()
-        client = Client("FL001", "Иван Иванов", "1990-05-15")
-        bank.add_client(client)
+        bank = self.bank
 
         acc_uuid = bank.open_account(
-            "FL001", BankAccount, Currency.RUB, balance=500, logger=mock_logger
+            "FL001", BankAccount, Currency.RUB, balance=500, logger=self.logger
         )
 
         processor = TransactionProcessor(bank)
@@ -1226,21 +1923,17 @@ class TestTransactionProcessor(unittest.TestCase):
         self.assertFalse(result)
         self.assertEqual(tx.status, TransactionStatus.FAILED)
         self.assertIn("Insufficient funds", tx.failure_reason)
+        self.assertIs(tx.failure_code, FailureReason.INSUFFICIENT_FUNDS)
 
     def test_process_transfer_success(self):
         """Тест успешного перевода между счетами"""
-        mock_logger = MockLogger()
-        bank = Bank()
-        client1 = Client("FL001", "Иван Иванов", "1990-05-15")
-        client2 = Client("FL002", "Мария Петрова", "1985-03-20")
-        bank.add_client(client1)
-        bank.add_client(client2)
+        bank = self.bank
 
         acc1 = bank.open_account(
-            "FL001", BankAccount, Currency.RUB, balance=5000, logger=mock_logger
+            "FL001", BankAccount, Currency.RUB, balance=5000, logger=self.logger
         )
         acc2 = bank.open_account(
-            "FL002", BankAccount, Currency.RUB, balance=1000, logger=mock_logger
+            "FL002", BankAccount, Currency.RUB, balance=1000, logger=self.logger
         )
 
         processor = TransactionProcessor(bank)
@@ -1261,18 +1954,13 @@ class TestTransactionProcessor(unittest.TestCase):
 
     def test_process_transfer_frozen_account(self):
         """Тест перевода с замороженного счёта"""
-        mock_logger = MockLogger()
-        bank = Bank()
-        client1 = Client("FL001", "Иван Иванов", "1990-05-15")
-        client2 = Client("FL002", "Мария Петрова", "1985-03-20")
-        bank.add_client(client1)
-        bank.add_client(client2)
+        bank = self.bank
 
         acc1 = bank.open_account(
-            "FL001", BankAccount, Currency.RUB, balance=5000, logger=mock_logger
+            "FL001", BankAccount, Currency.RUB, balance=5000, logger=self.logger
         )
         acc2 = bank.open_account(
-            "FL002", BankAccount, Currency.RUB, balance=1000, logger=mock_logger
+            "FL002", BankAccount, Currency.RUB, balance=1000, logger=self.logger
         )
 
         bank.freeze_account(acc1, "admin")
@@ -1291,16 +1979,53 @@ class TestTransactionProcessor(unittest.TestCase):
 
         self.assertFalse(result)
         self.assertEqual(tx.status, TransactionStatus.FAILED)
+        self.assertIs(tx.failure_code, FailureReason.ACCOUNT_FROZEN)
+
+    def test_handler_returns_outcome(self):
+        """Тест: обработчик возвращает итог вместо исключения"""
+        bank = self.bank
+
+        acc_uuid = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=100, logger=self.logger
+        )
+
+        processor = TransactionProcessor(bank)
+        tx = Transaction(
+            transaction_id="TX001",
+            transaction_type=TransactionType.EXTERNAL_TRANSFER,
+            amount=500,
+            currency=Currency.RUB,
+            sender_account_id=acc_uuid,
+        )
+        self.assertIs(
+            processor._process_external_transfer(tx).outcome, TransactionOutcome.FAIL
+        )
+
+        bank.freeze_account(acc_uuid, "admin")
+        result = processor._process_external_transfer(tx)
+        self.assertIs(result.outcome, TransactionOutcome.FAIL)
+        self.assertEqual(result.error, "Account is frozen")
+
+        missing = Transaction(
+            transaction_id="TX002",
+            transaction_type=TransactionType.WITHDRAWAL,
+            amount=10,
+            currency=Currency.RUB,
+            sender_account_id="missing",
+        )
+        self.assertIs(
+            processor._process_withdrawal(missing).outcome, TransactionOutcome.RETRY
+        )
+        self.assertFalse(processor.process_transaction(missing))
+        self.assertEqual(missing.failure_reason, "Max retries exceeded: Account not found")
+        self.assertIs(missing.failure_code, FailureReason.ACCOUNT_NOT_FOUND)
 
     def test_process_external_transfer_success(self):
         """Тест успешного внешнего перевода"""
-        mock_logger = MockLogger()
-        bank = Bank()
-        client = Client("FL001", "Иван Иванов", "1990-05-15")
-        bank.add_client(client)
+        bank = self.bank
 
         acc_uuid = bank.open_account(
-            "FL001", BankAccount, Currency.RUB, balance=10000, logger=mock_logger
+            "FL001", BankAccount, Currency.RUB, balance=10000, logger=self.logger
         )
 
         processor = TransactionProcessor(bank)
@@ -1320,13 +2045,10 @@ class TestTransactionProcessor(unittest.TestCase):
 
     def test_get_failed_transactions(self):
         """Тест получения списка неудачных транзакций"""
-        mock_logger = MockLogger()
-        bank = Bank()
-        client = Client("FL001", "Иван Иванов", "1990-05-15")
-        bank.add_client(client)
+        bank = self.bank
 
         acc_uuid = bank.open_account(
-            "FL001", BankAccount, Currency.RUB, balance=500, logger=mock_logger
+            "FL001", BankAccount, Currency.RUB, balance=500, logger=self.logger
         )
 
         processor = TransactionProcessor(bank)
@@ -1344,6 +2066,189 @@ class TestTransactionProcessor(unittest.TestCase):
         self.assertEqual(len(failed), 1)
         self.assertEqual(failed[0].transaction_id, "TX001")
 
+    def test_failed_transactions_bounded_and_drained(self):
+        """Тест: буфер отказов ограничен и очищается при выгрузке"""
+        processor = TransactionProcessor(make_bank(), max_failed=2)
+        transactions = [
+            Transaction(f"TX{i}", "bogus", 100, Currency.RUB) for i in range(3)
+        ]
+        for tx in transactions:
+            processor.process_transaction(tx)
+
+        self.assertEqual(processor.get_failed_transactions(), transactions[1:])
+        self.assertIs(transactions[0].failure_code, FailureReason.UNSUPPORTED_TYPE)
+        self.assertEqual(processor.drain_failed(), transactions[1:])
+        self.assertEqual(processor.get_failed_transactions(), [])
+
+    def test_processor_logging_levels(self):
+        """Тест: успех пишется только в verbose-режиме, отказ — всегда"""
+        bank = self.bank
+        acc_uuid = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=100, logger=self.logger
+        )
+
+        def deposit():
+            return TransactionFactory.create_deposit(acc_uuid, 50, Currency.RUB)
+
+        with self.assertLogs("tests.processor", level="INFO") as captured:
+            quiet = TransactionProcessor(
+                bank, logger=logging.getLogger("tests.processor")
+            )
+            quiet.process_transaction(deposit())
+            quiet.process_transaction(
+                Transaction(
+                    transaction_id="TXW",
+                    transaction_type=TransactionType.WITHDRAWAL,
+                    amount=1000,
+                    currency=Currency.RUB,
+                    sender_account_id=acc_uuid,
+                )
+            )
+
+        self.assertEqual(len(captured.records), 1)
+        self.assertEqual(captured.records[0].levelno, logging.WARNING)
+
+        with self.assertLogs("tests.processor", level="INFO") as captured:
+            verbose = TransactionProcessor(
+                bank, logger=logging.getLogger("tests.processor"), verbose=True
+            )
+            verbose.process_transaction(deposit())
+
+        self.assertEqual(captured.records[0].levelno, logging.INFO)
+
+    def test_process_batch_parallel(self):
+        """Тест параллельной обработки: результат совпадает с последовательным"""
+        bank = self.bank
+        accounts = [
+            bank.open_account(
+                "FL001", BankAccount, Currency.RUB, balance=0, logger=self.logger
+            )
+            for _ in range(5)
+        ]
+
+        batch = []
+        for acc_uuid in accounts:
+            for _ in range(20):
+                batch.append(TransactionFactory.create_deposit(acc_uuid, 10, Currency.RUB))
+            batch.append(
+                Transaction(
+                    transaction_id="W",
+                    transaction_type=TransactionType.WITHDRAWAL,
+                    amount=150,
+                    currency=Currency.RUB,
+                    sender_account_id=acc_uuid,
+                )
+            )
+        # Перевод выполняется после всех предыдущих операций
+        batch.append(
+            TransactionFactory.create_transfer(accounts[0], accounts[1], 50, Currency.RUB)
+        )
+
+        results = TransactionProcessor(bank).process_batch_parallel(batch, workers=3)
+
+        self.assertTrue(all(results))
+        self.assertEqual(len(results), len(batch))
+        self.assertEqual(bank.accounts[accounts[0]].balance, 0)
+        self.assertEqual(bank.accounts[accounts[1]].balance, 100)
+        for acc_uuid in accounts[2:]:
+            self.assertEqual(bank.accounts[acc_uuid].balance, 50)
+
+    def test_processor_keeps_subclass_rules(self):
+        """Тест: процессор применяет правила подклассов счетов"""
+        bank = self.bank
+        savings = bank.open_account(
+            "FL001",
+            SavingsAccount,
+            Currency.RUB,
+            monthly_interest_rate=0.01,
+            balance=1500,
+            min_balance=1000,
+            logger=self.logger,
+        )
+        premium = bank.open_account(
+            "FL001", PremiumAccount, Currency.RUB, balance=100, logger=self.logger
+        )
+        processor = TransactionProcessor(bank)
+
+        withdrawal = Transaction(
+            transaction_id="TXW",
+            transaction_type=TransactionType.WITHDRAWAL,
+            amount=600,
+            currency=Currency.RUB,
+            sender_account_id=savings,
+        )
+        self.assertFalse(processor.process_transaction(withdrawal))
+        self.assertEqual(bank.accounts[savings].balance, 1500)
+
+        overdraft = Transaction(
+            transaction_id="TXO",
+            transaction_type=TransactionType.WITHDRAWAL,
+            amount=200,
+            currency=Currency.RUB,
+            sender_account_id=premium,
+        )
+        self.assertTrue(processor.process_transaction(overdraft))
+        self.assertTrue(bank.accounts[premium].fee_charged)
+
+        processor.process_transaction(
+            TransactionFactory.create_deposit(premium, 500, Currency.RUB)
+        )
+        self.assertFalse(bank.accounts[premium].fee_charged)
+
+    def test_process_unknown_transaction_type(self):
+        """Тест: неизвестный тип транзакции отклоняется без повторов"""
+        processor = TransactionProcessor(make_bank())
+        tx = Transaction(
+            transaction_id="TX001",
+            transaction_type="bogus",
+            amount=100,
+            currency=Currency.RUB,
+        )
+
+        self.assertFalse(processor.process_transaction(tx))
+        self.assertEqual(tx.status, TransactionStatus.FAILED)
+        self.assertEqual(processor.get_failed_transactions(), [tx])
+
+    def test_process_batch(self):
+        """Тест пакетной обработки: порядок сохраняется, ошибки изолированы"""
+        bank = self.bank
+
+        acc1 = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=0, logger=self.logger
+        )
+        acc2 = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=100, logger=self.logger
+        )
+        frozen = bank.open_account(
+            "FL001", BankAccount, Currency.RUB, balance=100, logger=self.logger
+        )
+        bank.freeze_account(frozen, "admin")
+
+        batch = [
+            TransactionFactory.create_deposit(acc1, 300, Currency.RUB),
+            TransactionFactory.create_deposit(acc2, 50, Currency.RUB),
+            TransactionFactory.create_deposit(frozen, 10, Currency.RUB),
+            TransactionFactory.create_deposit(acc1, 200, Currency.RUB),
+            # Снятие видит пополнения, пришедшие раньше в пакете
+            Transaction(
+                transaction_id="TXW",
+                transaction_type=TransactionType.WITHDRAWAL,
+                amount=500,
+                currency=Currency.RUB,
+                sender_account_id=acc1,
+            ),
+            TransactionFactory.create_deposit(acc1, 10, Currency.RUB),
+        ]
+
+        results = TransactionProcessor(bank).process_batch(batch)
+
+        self.assertEqual(results, [True, True, False, True, True, True])
+        self.assertEqual(bank.accounts[acc1].balance, 10)
+        self.assertEqual(bank.accounts[acc2].balance, 150)
+        self.assertEqual(bank.accounts[frozen].balance, 100)
+        self.assertEqual(batch[2].status, TransactionStatus.FAILED)
+        self.assertEqual(batch[0].status, TransactionStatus.COMPLETED)
+
 
 class TestTransactionFactory(unittest.TestCase):
     """Тесты для класса TransactionFactory"""
@@ -1384,5 +2289,14 @@ class TestTransactionFactory(unittest.TestCase):
         self.assertGreater(tx.fee, 0)  # Комиссия должна быть начислена
 
 
+class TestSuiteLayout(unittest.TestCase):
+    """Тесты структуры самого тестового модуля"""
+
+    def test_no_module_level_tests(self):
+        """Тест: все test_* объявлены внутри TestCase и попадают в прогон"""
+        stray = [name for name in globals() if name.startswith("test_")]
+        self.assertEqual(stray, [])
+
+
 if __name__ == "__main__":
-    unittest.main(verbosity=2)
+    unittest.main()